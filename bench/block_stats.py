@@ -0,0 +1,56 @@
+"""
+Compare the per-channel statistics in recs.audio.block against the
+separate reductions they replaced.
+
+    python -m bench.block_stats
+"""
+
+import timeit
+
+import numpy as np
+
+from recs.audio.block import Block
+
+NUMBER = 500
+REPEAT = 7
+SHAPES = (128, 2), (512, 2), (4096, 2), (512, 32), (512, 64), (2048, 64)
+DTYPES = 'int16', 'int32', 'float32'
+
+
+def separate(a: np.ndarray) -> None:  # type: ignore[type-arg]
+    b = Block(a)
+    ma, mi = a.max(0), a.min(0)
+    (ma - mi) / (2 * b.scale)
+    f = a.astype('float') / b.scale
+    f *= f
+    np.sqrt(f.mean(0))
+
+
+def fused(a: np.ndarray) -> None:  # type: ignore[type-arg]
+    b = Block(a)
+    assert b.amplitude.shape == b.rms.shape
+
+
+def main() -> None:
+    rng = np.random.default_rng(seed=0)
+
+    for dtype in DTYPES:
+        for shape in SHAPES:
+            a = rng.uniform(-0.5, 0.5, size=shape)
+            if dtype != 'float32':
+                a *= np.iinfo(dtype).max
+            a = a.astype(dtype)
+
+            before, after = (
+                min(timeit.repeat(lambda: f(a), number=NUMBER, repeat=REPEAT))  # noqa: B023
+                / NUMBER
+                for f in (separate, fused)
+            )
+            print(
+                f'{dtype:>8} {shape!s:>10}: {1e6 * before:8.2f}us ->',
+                f'{1e6 * after:8.2f}us ({before / after:.2f}x)',
+            )
+
+
+if __name__ == '__main__':
+    main()
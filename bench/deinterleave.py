@@ -0,0 +1,51 @@
+"""
+Compare slicing each track out of a 64-channel device with deinterleaving
+all the tracks at once.
+
+    python -m bench.deinterleave
+"""
+
+import timeit
+
+import numpy as np
+
+from recs.audio.block import Block
+from recs.audio.deinterleave import Deinterleaver
+
+CHANNELS = 64
+NUMBER = 500
+FRAMES = 128, 512, 4096
+SLICES = [slice(i, i + 2) for i in range(0, CHANNELS, 2)]
+
+
+def sliced(a: np.ndarray) -> None:  # type: ignore[type-arg]
+    for s in SLICES:
+        b = Block(a[:, s])
+        assert b.volume >= 0
+        # SoundFile.write() makes a contiguous copy of a strided array
+        np.ascontiguousarray(b.block)
+
+
+def deinterleaved(a: np.ndarray, d: Deinterleaver) -> None:  # type: ignore[type-arg]
+    for array in d(a):
+        b = Block(array)
+        assert b.volume >= 0
+        np.ascontiguousarray(b.block)
+
+
+def main() -> None:
+    rng = np.random.default_rng(seed=0)
+    d = Deinterleaver(SLICES)
+
+    for frames in FRAMES:
+        a = rng.uniform(-0.5, 0.5, size=(frames, CHANNELS)).astype('float32')
+        before = timeit.timeit(lambda: sliced(a), number=NUMBER) / NUMBER  # noqa: B023
+        after = timeit.timeit(lambda: deinterleaved(a, d), number=NUMBER) / NUMBER  # noqa: B023
+        print(
+            f'{frames:5} frames x {CHANNELS} channels: {1e6 * before:8.2f}us ->',
+            f'{1e6 * after:8.2f}us ({before / after:.2f}x)',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Measure how many 48kHz mono channels one core of the recording process can
+encode itself, against only copying PCM into an EncoderPool.
+
+    python -m bench.encoder_pool
+"""
+
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from recs.audio.encoder_pool import EncoderPool
+from recs.audio.file_opener import FileOpener
+from recs.base.types import Array, Format
+
+CHUNK = 0x4000
+SAMPLERATE = 48_000
+SECONDS = 20
+TRACKS = 4
+FORMATS = Format.flac, Format.mp3, Format.ogg
+
+
+def audio() -> Array:
+    rng = np.random.default_rng(0)
+    time = np.arange(SECONDS * SAMPLERATE) / SAMPLERATE
+    sound = 0.25 * np.sin(2 * np.pi * 440 * time) + rng.normal(0, 0.01, len(time))
+    return sound.astype(np.float32).reshape(-1, 1)
+
+
+def inline(opener: FileOpener, data: Array, directory: Path) -> float:
+    start = time.process_time()
+    for i in range(TRACKS):
+        with opener.open(directory / f'inline-{i}', {}) as fp:
+            for j in range(0, len(data), CHUNK):
+                fp.write(data[j : j + CHUNK])
+    return time.process_time() - start
+
+
+def pool(opener: FileOpener, data: Array, directory: Path) -> tuple[float, float]:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    encoders = EncoderPool(TRACKS)
+    with encoders:
+        start = time.process_time()
+        lanes = [encoders.lane() for i in range(TRACKS)]
+        files = [lane.create(opener, {}, directory / 'pool') for lane in lanes]
+        for j in range(0, len(data), CHUNK):
+            for f in files:
+                f.write(data[j : j + CHUNK])
+        for f in files:
+            f.close()
+        parent = time.process_time() - start
+
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    workers = after.ru_utime + after.ru_stime - children.ru_utime - children.ru_stime
+    return parent, workers
+
+
+def main() -> None:
+    data = audio()
+    channel_seconds = TRACKS * SECONDS
+
+    for format in FORMATS:
+        opener = FileOpener(format=format, channels=1, samplerate=SAMPLERATE)
+        with tempfile.TemporaryDirectory() as directory:
+            before = inline(opener, data, Path(directory))
+            after, workers = pool(opener, data, Path(directory))
+
+        print(
+            f'{format:4}: inline {channel_seconds / before:7.1f} channels/core,',
+            f'pool {channel_seconds / after:8.1f} channels/core',
+            f'(workers {channel_seconds / workers:5.1f} channels/core)',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Count the stat calls made on the audio thread while recording a minute of loud
+audio, and time reading the total size of the files written.
+
+    python -m bench.file_size
+"""
+
+import os
+import tempfile
+import threading
+import timeit
+import typing as t
+
+import numpy as np
+
+from recs.audio.block import Block
+from recs.audio.channel_writer import ChannelWriter
+from recs.cfg import Cfg, InputDevice, Track
+
+BLOCK_SIZE = 128
+SAMPLERATE = 48_000
+SECONDS = 60
+NUMBER = 10_000
+
+
+def main() -> None:
+    calls = 0
+    stat = os.stat
+
+    def counted_stat(*args: t.Any, **kwargs: t.Any) -> os.stat_result:
+        nonlocal calls
+        calls += threading.current_thread() is threading.main_thread()
+        return stat(*args, **kwargs)
+
+    info = {'name': 'bench', 'max_input_channels': 2, 'default_samplerate': SAMPLERATE}
+    track = Track(InputDevice(info), '1-2')
+    rng = np.random.default_rng(seed=0)
+    a = rng.uniform(-0.5, 0.5, (BLOCK_SIZE, 2)).astype('float32')
+    count = SECONDS * SAMPLERATE // BLOCK_SIZE
+
+    with tempfile.TemporaryDirectory() as directory:
+        cfg = Cfg(output_directory=directory, shortest_file_time=0)
+        times = cfg.times.scale(SAMPLERATE)
+
+        with ChannelWriter(cfg, times, track) as writer:
+            os.stat = counted_stat
+            try:
+                for i in range(count):
+                    writer._receive_block(Block(a), i * BLOCK_SIZE / SAMPLERATE)
+            finally:
+                os.stat = stat
+
+            files = writer.files_written
+            total = timeit.timeit(lambda: files.total_size, number=NUMBER)
+            getsize = timeit.timeit(lambda: os.path.getsize(files[-1]), number=NUMBER)
+
+    scale = 1_000_000 / NUMBER
+    print(f'{calls} stat calls in {count} blocks')
+    print(f'Before: {scale * getsize:6.3f}us to read the size')
+    print(f'After:  {scale * total:6.3f}us to read the size')
+
+
+if __name__ == '__main__':
+    main()
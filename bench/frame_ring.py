@@ -0,0 +1,106 @@
+"""Compare the enqueue and handoff latency of 64-frame blocks from a paced 48kHz
+callback, for a copy put on a Queue and for a FrameRing.
+
+    python -m bench.frame_ring
+"""
+
+import statistics
+import threading
+import time
+from queue import Empty, Queue
+
+import numpy as np
+
+from recs.audio.block_stats import block_stats
+from recs.base.types import Array
+from recs.misc.frame_ring import FrameRing
+
+BLOCK_FRAMES = 64
+CHANNELS = 8
+SAMPLERATE = 48_000
+SECONDS = 3
+
+
+class QueueChannel:
+    def __init__(self) -> None:
+        self.queue: Queue[tuple[Array, float]] = Queue()
+
+    def put(self, array: Array, timestamp: float) -> None:
+        self.queue.put((array.copy(), timestamp))
+
+    def get(self) -> tuple[Array, float] | None:
+        try:
+            return self.queue.get(timeout=0.05)
+        except Empty:
+            return None
+
+    def release(self) -> None:
+        pass
+
+
+class RingChannel:
+    def __init__(self) -> None:
+        self.ring = FrameRing()
+
+    def put(self, array: Array, timestamp: float) -> None:
+        self.ring.put(array, timestamp)
+
+    def get(self) -> tuple[Array, float] | None:
+        return self.ring.get(timeout=0.05)
+
+    def release(self) -> None:
+        self.ring.release()
+
+
+def run(channel: QueueChannel | RingChannel) -> tuple[list[float], list[float]]:
+    block = np.random.default_rng(0).integers(
+        -0x8000, 0x8000, (BLOCK_FRAMES, CHANNELS), dtype=np.int16
+    )
+    enqueue: list[float] = []
+    handoff: list[float] = []
+    done = threading.Event()
+
+    def consume() -> None:
+        while not done.is_set():
+            if item := channel.get():
+                handoff.append(time.perf_counter() - item[1])
+                block_stats(item[0])
+                channel.release()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+
+    period = BLOCK_FRAMES / SAMPLERATE
+    start = time.perf_counter()
+    for i in range(round(SECONDS / period)):
+        if (delay := start + i * period - time.perf_counter()) > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        channel.put(block, now)
+        enqueue.append(time.perf_counter() - now)
+
+    done.set()
+    consumer.join()
+    return enqueue, handoff
+
+
+def describe(name: str, times: list[float]) -> str:
+    us = sorted(1_000_000 * t for t in times)
+    p99 = us[int(0.99 * len(us))]
+    jitter = statistics.pstdev(us)
+    return (
+        f'{name:8}: mean {statistics.fmean(us):7.2f}us, p99 {p99:7.2f}us, '
+        f'max {us[-1]:8.2f}us, jitter {jitter:7.2f}us'
+    )
+
+
+def main() -> None:
+    for channel in QueueChannel(), RingChannel():
+        enqueue, handoff = run(channel)
+        print(f'{type(channel).__name__} ({len(enqueue)} blocks)')
+        print('   ', describe('enqueue', enqueue))
+        print('   ', describe('handoff', handoff))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare the cost of reporting the state of every track of one device after each
+block, by pickling it through a pipe to the parent, which unpickles it and adds
+it to its totals, with writing it in place into a shared MeterTable.
+
+    python -m bench.meter_table
+"""
+
+import timeit
+from multiprocessing import Pipe
+
+from recs.base.state import ChannelState
+from recs.ui.meter_table import MeterTable
+
+NUMBER = 2_000
+TRACKS = 1, 4, 8, 16
+
+
+def main() -> None:
+    parent, child = Pipe()
+
+    for tracks in TRACKS:
+        state = ChannelState(
+            file_count=1, file_size=0x10000, volume=(0.25, 0.25), is_active=True
+        )
+        names = [f'{2 * i + 1}-{2 * i + 2}' for i in range(tracks)]
+        totals = {n: ChannelState() for n in names}
+        meters = MeterTable(tracks)
+
+        def pipe() -> None:
+            child.send({'device': {n: state for n in names}})  # noqa: B023
+            for n, s in parent.recv()['device'].items():
+                totals[n] += s  # noqa: B023
+
+        states = [state] * tracks
+
+        def table() -> None:
+            meters.write(0, states)  # noqa: B023
+
+        p = timeit.timeit(pipe, number=NUMBER) / NUMBER
+        m = timeit.timeit(table, number=NUMBER) / NUMBER
+        meters.close()
+
+        scale = 1_000_000
+        print(f'{tracks:2} tracks: pipe {scale * p:7.2f}us, table {scale * m:7.2f}us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Compare computing statistics for each stereo track of a device separately
+with computing them once for the whole device and slicing the results.
+
+    python -m bench.metering
+"""
+
+import timeit
+
+import numpy as np
+
+from recs.audio.block import Block
+from recs.audio.block_stats import block_stats
+
+FRAMES = 256
+NUMBER = 500
+CHANNELS = 2, 8, 16, 32, 64
+
+
+def per_track(a: np.ndarray, slices: list[slice]) -> None:  # type: ignore[type-arg]
+    for s in slices:
+        assert Block(a[:, s]).volume >= 0
+
+
+def per_device(a: np.ndarray, slices: list[slice]) -> None:  # type: ignore[type-arg]
+    stats = block_stats(a)
+    for s in slices:
+        assert Block(a[:, s]).seed(stats[s]).volume >= 0
+
+
+def main() -> None:
+    rng = np.random.default_rng(seed=0)
+
+    for channels in CHANNELS:
+        a = rng.uniform(-0.5, 0.5, size=(FRAMES, channels)).astype('float32')
+        slices = [slice(i, i + 2) for i in range(0, channels, 2)]
+
+        before, after = (
+            timeit.timeit(lambda: f(a, slices), number=NUMBER) / NUMBER  # noqa: B023
+            for f in (per_track, per_device)
+        )
+        print(
+            f'{channels:3} channels: {1e6 * before:8.2f}us ->',
+            f'{1e6 * after:8.2f}us ({before / after:.2f}x)',
+        )
+
+
+if __name__ == '__main__':
+    main()
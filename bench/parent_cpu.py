@@ -0,0 +1,106 @@
+"""Measure the parent CPU used while 8 devices of 16 channels report their states
+per block, per UI refresh, or through a shared MeterTable.
+
+    python -m bench.parent_cpu
+"""
+
+import multiprocessing as mp
+import time
+import typing as t
+from multiprocessing import connection
+
+from recs.base.state import ChannelState
+from recs.cfg import InputDevice, Track
+from recs.ui.full_state import FullState
+from recs.ui.meter_table import MeterTable
+
+BLOCK_TIME = 128 / 48_000
+CHANNELS = 16
+DEVICES = 8
+SECONDS = 3
+UI_REFRESH_RATE = 23
+
+
+def child(
+    device: str, conn: connection.Connection, meters: MeterTable, mode: str
+) -> None:
+    names = [str(i + 1) for i in range(CHANNELS)]
+    states = {n: ChannelState() for n in names}
+    offset = int(device) * CHANNELS
+    report_time = start = time.perf_counter()
+    blocks = 0
+
+    while (now := time.perf_counter()) < start + SECONDS:
+        delta = ChannelState(file_size=512, recorded_time=BLOCK_TIME, max_amp=0.5)
+        if mode == 'block':
+            conn.send({device: dict.fromkeys(names, delta)})
+        else:
+            for s in states.values():
+                s += delta
+            if now >= report_time:
+                report_time = now + 1 / UI_REFRESH_RATE
+                if mode == 'merged':
+                    conn.send({device: states})
+                    states = {n: ChannelState() for n in names}
+                else:
+                    meters.write(offset, list(states.values()))
+
+        blocks += 1
+        time.sleep(max(0, start + blocks * BLOCK_TIME - time.perf_counter()))
+
+    conn.send(None)
+
+
+def parent(mode: str) -> float:
+    devices = [str(i) for i in range(DEVICES)]
+    sources = [InputDevice(_info(d)) for d in devices]
+    state = FullState(
+        [(s, [Track(s, str(i + 1)) for i in range(CHANNELS)]) for s in sources]
+    )
+    meters = MeterTable(DEVICES * CHANNELS)
+    pipes = [mp.Pipe() for _ in devices]
+    processes = [
+        mp.Process(target=child, args=(d, c, meters, mode))
+        for d, (_, c) in zip(devices, pipes)
+    ]
+    connections = [p for p, _ in pipes]
+
+    for p in processes:
+        p.start()
+
+    cpu = time.process_time()
+    refresh_time = 0.0
+    while connections:
+        for c in connection.wait(connections, timeout=1 / UI_REFRESH_RATE):
+            conn = t.cast(connection.Connection, c)
+            if (msg := conn.recv()) is None:
+                connections.remove(conn)
+            elif mode != 'table':
+                for device_name, device_state in msg.items():
+                    for name, s in device_state.items():
+                        state.state[device_name][name] += s
+
+        if mode == 'table' and (now := time.perf_counter()) >= refresh_time:
+            refresh_time = now + 1 / UI_REFRESH_RATE
+            state.update(meters.read())
+
+    cpu = time.process_time() - cpu
+    for p in processes:
+        p.join()
+    meters.close()
+    return cpu
+
+
+def _info(name: str) -> dict[str, float | int | str]:
+    return {'name': name, 'max_input_channels': CHANNELS, 'default_samplerate': 48_000}
+
+
+def main() -> None:
+    print(f'{DEVICES} devices x {CHANNELS} channels, {SECONDS} seconds:')
+    for mode in 'block', 'merged', 'table':
+        cpu = parent(mode)
+        print(f'{mode:>6}: parent CPU {cpu:6.3f}s, {100 * cpu / SECONDS:5.1f}%')
+
+
+if __name__ == '__main__':
+    main()
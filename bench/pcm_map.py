@@ -0,0 +1,78 @@
+"""
+Compare reading and splitting a long stereo 16-bit WAV file when FileSource maps
+it from disk with when libsndfile decodes it.
+
+    python -m bench.pcm_map
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from recs.audio import splitter
+from recs.base.types import SdType
+from recs.cfg import Cfg, FileSource, Track
+from recs.cfg.source import Update
+from recs.misc import pcm_map
+
+SAMPLERATE = 48_000
+MINUTES = 30
+
+# Mostly quiet, like an archive of field recordings
+PATTERN = (10, 0.5), (50, 0)
+
+
+def write(path: Path) -> None:
+    rng = np.random.default_rng(0)
+    with sf.SoundFile(path, 'w', SAMPLERATE, 2, 'PCM_16') as fp:
+        while fp.frames < MINUTES * 60 * SAMPLERATE:
+            for seconds, amplitude in PATTERN:
+                frames = seconds * SAMPLERATE
+                fp.write(rng.uniform(-amplitude, amplitude, (frames, 2)) + 1e-5)
+
+
+def read(source: FileSource) -> float:
+    def callback(u: Update) -> None:
+        pass
+
+    stream = source.input_stream(SdType.int16, callback)
+    start = time.perf_counter()
+    stream.start()
+    stream.join()
+    return time.perf_counter() - start
+
+
+def split(source: FileSource, directory: Path) -> float:
+    directory.mkdir()
+    cfg = Cfg(output_directory=str(directory), format='wav', stop_after_quiet=2)
+    start = time.perf_counter()
+    splitter.split(cfg, Track(source, '1-2'))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        write(root / 'in.wav')
+        source = FileSource(root / 'in.wav')
+        size = (root / 'in.wav').stat().st_size / 0x10_0000
+        read(source)  # Warm up the page cache
+
+        dtypes = pcm_map.DTYPES
+        print(f'{size:.0f}MB file    read MB/s   split x real time')
+        for name in 'mapped', 'decoded':
+            if name == 'decoded':
+                pcm_map.DTYPES = {}  # Nothing can be mapped
+            read_time = read(source)
+            split_time = split(source, root / name)
+            pcm_map.DTYPES = dtypes
+
+            speed = MINUTES * 60 / split_time
+            print(f'{name:9}  {size / read_time:13.0f}  {speed:18.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the peak memory and speed of reading a 10-channel 24-bit file through
+FileSource, for a range of memory budgets.  24-bit files can't be mapped from
+disk, so they are decoded in chunks.
+
+    python -m bench.read_memory
+"""
+
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from recs.base.types import SdType
+from recs.cfg import FileSource
+from recs.cfg.source import Update
+
+CHANNELS = 10
+SAMPLERATE = 48_000
+SECONDS = 600
+BUDGETS = 0x10_0000, 0x100_0000, 0x400_0000, 0x1000_0000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'in.wav'
+        rng = np.random.default_rng(0)
+        with sf.SoundFile(path, 'w', SAMPLERATE, CHANNELS, 'PCM_24') as fp:
+            for _ in range(SECONDS):
+                fp.write(rng.uniform(-0.5, 0.5, (SAMPLERATE, CHANNELS)))
+
+        print('   budget       peak  real time')
+        for budget in BUDGETS:
+            frames = 0
+
+            def callback(u: Update) -> None:
+                nonlocal frames
+                frames += len(u.array)
+
+            stream = FileSource(path, budget).input_stream(SdType.float32, callback)
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            stream.start()
+            stream.join()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            assert frames == SECONDS * SAMPLERATE
+            speed = SECONDS / elapsed
+            print(f'{budget >> 20:7}M  {peak / 0x10_0000:8.1f}M  {speed:8.0f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare the time to split a long file for silence by replaying it through a
+ChannelWriter block by block, as a FileSource does, with the offline splitter.
+
+    python -m bench.splitter
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from recs.audio import splitter
+from recs.audio.channel_writer import ChannelWriter
+from recs.cfg import Cfg, FileSource, Track
+from recs.cfg.source import Update
+
+SAMPLERATE = 48_000
+MINUTES = 20
+
+# An LP side: tracks of a few minutes, with a few seconds of quiet between them
+PATTERN = (200, 0.5), (4, 0), (150, 0.5), (5, 0), (240, 0.5), (30, 0)
+
+
+def write(path: Path) -> None:
+    rng = np.random.default_rng(0)
+    with sf.SoundFile(path, 'w', SAMPLERATE, 2, 'PCM_16') as fp:
+        while fp.frames < MINUTES * 60 * SAMPLERATE:
+            for seconds, amplitude in PATTERN:
+                frames = seconds * SAMPLERATE
+                fp.write(rng.uniform(-amplitude, amplitude, (frames, 2)) + 1e-5)
+
+
+def replay(cfg: Cfg, track: Track) -> None:
+    writer = ChannelWriter(cfg, cfg.times.scale(SAMPLERATE), track)
+
+    def receive(update: Update) -> None:
+        writer.receive_update(update)
+
+    with writer:
+        stream = track.source.input_stream(cfg.sdtype, receive)
+        stream.start()
+        stream.join()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        write(root / 'side.wav')
+        track = Track(FileSource(root / 'side.wav'), '1-2')
+
+        for name in 'replay', 'offline':
+            (root / name).mkdir()
+            cfg = Cfg(
+                output_directory=str(root / name), format='wav', stop_after_quiet=2
+            )
+
+            start = time.perf_counter()
+            if name == 'replay':
+                replay(cfg, track)
+            else:
+                splitter.split(cfg, track)
+            elapsed = time.perf_counter() - start
+
+            files = len(list((root / name).iterdir()))
+            speed = MINUTES * 60 / elapsed
+            print(f'{name:8} {elapsed:7.2f}s  {speed:6.0f}x real time, {files} files')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Time starting one child process per device, when each child rebuilds its Cfg
+and queries the devices again, as SourceRecorder once did, and when each child
+is given the parent's resolved Cfg.
+
+    python -m bench.startup
+"""
+
+import multiprocessing as mp
+import time
+import typing as t
+
+from recs.base.cfg_raw import CfgRaw
+from recs.cfg import Cfg
+
+DEVICES = 10
+
+
+def requery(cfg: CfgRaw) -> None:
+    assert Cfg(**cfg.asdict()).times
+
+
+def resolved(cfg: Cfg) -> None:
+    assert cfg.times
+
+
+def start(target: t.Callable[[t.Any], None], arg: object) -> float:
+    t = time.perf_counter()
+    processes = [mp.Process(target=target, args=(arg,)) for _ in range(DEVICES)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    return time.perf_counter() - t
+
+
+def main() -> None:
+    cfg = Cfg()
+    print(f'{DEVICES} child processes:')
+    for method in 'fork', 'spawn':
+        mp.set_start_method(method, force=True)
+        before = start(requery, cfg.cfg)
+        after = start(resolved, cfg)
+        print(f'{method:>5}: requery {before:6.3f}s, resolved {after:6.3f}s')
+
+
+if __name__ == '__main__':
+    main()
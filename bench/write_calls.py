@@ -0,0 +1,70 @@
+"""
+Count the calls to SoundFile.write() made while recording a minute of audio
+with alternating sound and silence, and compare them with the number of blocks
+written, which is how many calls were made before writes were staged.
+
+    python -m bench.write_calls
+"""
+
+import tempfile
+import typing as t
+
+import numpy as np
+from soundfile import SoundFile
+
+from recs.audio.block import Block
+from recs.audio.channel_writer import ChannelWriter
+from recs.audio.staging import Staging
+from recs.cfg import Cfg, InputDevice, Track
+
+BLOCK_SIZE = 128
+SAMPLERATE = 48_000
+SECONDS = 60
+PATTERN = (2, 0.5), (21, 0), (5, 0.5), (3, 0)
+
+
+def main() -> None:
+    calls, blocks = 0, 0
+    write = SoundFile.write
+    append = Staging.append
+
+    def counted_write(self: SoundFile, data: t.Any) -> None:
+        nonlocal calls
+        calls += 1
+        write(self, data)
+
+    def counted_append(self: Staging, array: t.Any) -> None:
+        nonlocal blocks
+        blocks += 1
+        append(self, array)
+
+    SoundFile.write = counted_write  # type: ignore[method-assign]
+    Staging.append = counted_append  # type: ignore[method-assign]
+
+    info = {'name': 'bench', 'max_input_channels': 2, 'default_samplerate': SAMPLERATE}
+    track = Track(InputDevice(info), '1-2')
+    rng = np.random.default_rng(seed=0)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cfg = Cfg(output_directory=directory, shortest_file_time=0)
+        times = cfg.times.scale(SAMPLERATE)
+        timestamp = 0.0
+
+        with ChannelWriter(cfg, times, track) as writer:
+            while timestamp < SECONDS:
+                for seconds, amplitude in PATTERN:
+                    for _ in range(int(seconds * SAMPLERATE / BLOCK_SIZE)):
+                        a = rng.uniform(-amplitude, amplitude, (BLOCK_SIZE, 2))
+                        writer._receive_block(Block(a.astype('float32')), timestamp)
+                        timestamp += BLOCK_SIZE / SAMPLERATE
+
+        files = len(writer.files_written)
+
+    minutes = timestamp / 60
+    print(f'{files} files written in {minutes:.2f} minutes')
+    print(f'Before: {blocks / minutes:9.1f} writes per recorded minute')
+    print(f'After:  {calls / minutes:9.1f} writes per recorded minute')
+
+
+if __name__ == '__main__':
+    main()
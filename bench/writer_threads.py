@@ -0,0 +1,77 @@
+"""
+Measure how many stereo tracks on one device a SourceRecorder can keep up with,
+as the number of threads passing each update to the tracks' ChannelWriters
+grows.
+
+    python -m bench.writer_threads
+"""
+
+import contextlib
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from recs.audio.block_stats import block_stats
+from recs.audio.channel_writer import ChannelWriter
+from recs.audio.deinterleave import Deinterleaver
+from recs.audio.writer_pool import WriterPool
+from recs.base.types import Array
+from recs.cfg import Cfg, InputDevice, Track
+
+BLOCK_SIZE = 512
+CHANNELS = 64
+SAMPLERATE = 48_000
+SECONDS = 10
+THREADS = 1, 2, 4, 8
+
+
+def run(threads: int, blocks: list[Array]) -> float:
+    device = InputDevice(
+        {
+            'name': 'bench',
+            'max_input_channels': CHANNELS,
+            'default_samplerate': SAMPLERATE,
+        }
+    )
+    tracks = [Track(device, f'{i + 1}-{i + 2}') for i in range(0, CHANNELS, 2)]
+    deinterleave = Deinterleaver([t.slice for t in tracks])
+
+    with tempfile.TemporaryDirectory() as directory:
+        cfg = Cfg(output_directory=directory, shortest_file_time=0)
+        times = cfg.times.scale(SAMPLERATE)
+
+        with contextlib.ExitStack() as stack:
+            writers = [ChannelWriter(cfg, times, t) for t in tracks]
+            for w in writers:
+                stack.enter_context(w)
+
+            pool = WriterPool(writers, threads)
+            stack.callback(pool.close)
+
+            start = time.perf_counter()
+            for i, block in enumerate(blocks):
+                pool(
+                    deinterleave(block), i * BLOCK_SIZE / SAMPLERATE, block_stats(block)
+                )
+            return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = np.random.default_rng(seed=0)
+    count = SECONDS * SAMPLERATE // BLOCK_SIZE
+    shape = BLOCK_SIZE, CHANNELS
+    blocks = [rng.uniform(-0.5, 0.5, shape).astype('float32')] * count
+    tracks = CHANNELS // 2
+
+    print(f'{os.cpu_count()} cores, {tracks} stereo tracks, {SECONDS}s of audio')
+    print('threads  updates/s  tracks in real time')
+    for threads in THREADS:
+        elapsed = run(threads, blocks)
+        realtime = tracks * SECONDS / elapsed
+        print(f'{threads:7}  {count / elapsed:9.0f}  {realtime:19.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,9 @@ import numpy as np
 
 from recs.cfg.source import to_matrix
 
+from . import block_stats
+from .block_stats import BlockStats
+
 _EMPTY_SEEN = False
 
 
@@ -27,35 +30,42 @@ class Block:
     def __getitem__(self, index: int | slice) -> 'Block':
         return Block(self.block[index])
 
+    def seed(self, stats: BlockStats) -> 'Block':
+        """Use statistics which were already computed for these frames"""
+        self.__dict__['stats'] = stats
+        return self
+
     @cached_property
     def is_float(self) -> bool:
         return not issubclass(self.block.dtype.type, numbers.Integral)
 
     @cached_property
     def scale(self) -> float:
-        if self.is_float:
-            return 1
-        return float(1 << (8 * self.block.dtype.itemsize - 1))
+        return block_stats.scale(self.block.dtype)
 
     @cached_property
     def volume(self) -> float:
-        return sum(self.amplitude) / len(self.amplitude)
+        return float(self.amplitude.mean())
 
     @cached_property
     def channel_count(self) -> int:
         return (self.block.shape + (1,))[1]
 
+    @cached_property
+    def stats(self) -> BlockStats:
+        return block_stats.block_stats(self.block)
+
     @cached_property
     def amplitude(self) -> np.ndarray:
-        return (self.max - self.min) / (2 * self.scale)
+        return self.stats.amplitude
 
     @cached_property
     def max(self) -> np.ndarray:
-        return self.block.max(0)
+        return self.stats.max
 
     @cached_property
     def min(self) -> np.ndarray:
-        return self.block.min(0)
+        return self.stats.min
 
     @cached_property
     def asfloat(self) -> 'Block':
@@ -67,37 +77,69 @@ class Block:
 
     @cached_property
     def rms(self) -> np.ndarray:
-        b = self.asfloat.block
-        if b is self.block:
-            b = b * b
-        else:
-            b *= b
-        return np.sqrt(b.mean(0))
+        s = self.stats
+        return np.sqrt(s.square_sum / s.length) / self.scale
 
 
-@dc.dataclass
 class Blocks:
-    blocks: list[Block] = dc.field(default_factory=list)
+    """A ring buffer of the most recent frames of one track, returned as views"""
+
     duration: int = 0
 
+    _array: np.ndarray | None = None
+    _begin: int = 0
+
+    def __init__(self, frames: int = 0) -> None:
+        self.frames = frames
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._array is None else len(self._array)
+
     def append(self, block: Block) -> None:
-        self.blocks.append(block)
-        self.duration += len(block)
+        size = self.duration + len(block)
+        if size > self.capacity:
+            self._resize(max(size, self.frames + len(block)), block.block)
+
+        assert self._array is not None
+        end = (self._begin + self.duration) % self.capacity
+        head = min(len(block), self.capacity - end)
+        self._array[end : end + head] = block.block[:head]
+        self._array[: len(block) - head] = block.block[head:]
+        self.duration = size
 
     def clear(self) -> None:
         self.duration = 0
-        self.blocks.clear()
+        self._begin = 0
 
     def clip(self, sample_length: int, from_start: bool) -> t.Sequence[Block]:
-        clipped = []
+        """Remove frames so at most sample_length remain; return the frames removed"""
         assert sample_length >= 0
-        while self.duration > sample_length:
-            clipped.append(self.blocks.pop(0 if from_start else -1))
-            self.duration -= len(clipped[-1])
+        if self.duration <= sample_length:
+            return []
+
+        removed = self.duration - sample_length
+        if from_start:
+            clipped = self._views(0, removed)
+            self._begin = (self._begin + removed) % self.capacity
+        else:
+            clipped = self._views(sample_length, self.duration)
+
+        self.duration = sample_length
         return clipped
 
     def __iter__(self) -> t.Iterator[Block]:
-        return iter(self.blocks)
-
-    def __getitem__(self, i: int) -> Block:
-        return self.blocks[i]
+        return iter(self._views(0, self.duration) if self.duration else ())
+
+    def _resize(self, capacity: int, like: np.ndarray) -> None:
+        array = np.empty((capacity, *like.shape[1:]), dtype=like.dtype)
+        if self.duration:
+            array[: self.duration] = np.concatenate([b.block for b in self])
+        self._array, self._begin = array, 0
+
+    def _views(self, begin: int, end: int) -> list[Block]:
+        assert self._array is not None
+        cap, begin, end = self.capacity, begin + self._begin, end + self._begin
+        head = self._array[begin : min(end, cap)]
+        tail = self._array[max(begin - cap, 0) : max(end - cap, 0)]
+        return [Block(v) for v in (head, tail) if len(v)]
@@ -0,0 +1,57 @@
+# mypy: disable-error-code="no-any-return, type-arg"
+
+import dataclasses as dc
+import numbers
+
+import numpy as np
+
+from recs.cfg.source import to_matrix
+
+# With fewer channels than this, a channel-major copy is quicker to reduce
+TRANSPOSE_CHANNELS = 64
+
+
+@dc.dataclass(frozen=True)
+class BlockStats:
+    """Per-channel statistics for a block of frames"""
+
+    amplitude: np.ndarray
+    max: np.ndarray
+    min: np.ndarray
+    square_sum: np.ndarray
+    length: int
+
+    def __getitem__(self, channels: slice) -> 'BlockStats':
+        return BlockStats(
+            amplitude=self.amplitude[channels],
+            max=self.max[channels],
+            min=self.min[channels],
+            square_sum=self.square_sum[channels],
+            length=self.length,
+        )
+
+
+def block_stats(array: np.ndarray) -> BlockStats:
+    """Compute every per-channel statistic for an array of frames"""
+    frames = to_matrix(array)
+    if frames.shape[1] < TRANSPOSE_CHANNELS:
+        rows = np.ascontiguousarray(frames.T)
+        max, min = rows.max(1), rows.min(1)
+        square_sum = np.einsum('ij,ij->i', rows, rows, dtype=np.float64)
+    else:
+        max, min = frames.max(0), frames.min(0)
+        square_sum = np.einsum('ij,ij->j', frames, frames, dtype=np.float64)
+
+    return BlockStats(
+        amplitude=(max.astype(np.float64) - min) / (2 * scale(array.dtype)),
+        max=max,
+        min=min,
+        square_sum=square_sum,
+        length=frames.shape[0],
+    )
+
+
+def scale(dtype: np.dtype) -> float:
+    if issubclass(dtype.type, numbers.Integral):
+        return float(1 << (8 * dtype.itemsize - 1))
+    return 1
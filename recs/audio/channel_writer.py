@@ -1,25 +1,30 @@
-import contextlib
 import typing as t
 from datetime import datetime
 from pathlib import Path
 from threading import Lock
 
 from overrides import override
-from soundfile import SoundFile
 from threa import Runnable
 
 from recs.base.state import ChannelState
 from recs.base.type_conversions import SDTYPE_TO_SUBTYPE, SUBTYPE_TO_SDTYPE
-from recs.base.types import SDTYPE, Active, Format, SdType
+from recs.base.types import SDTYPE, Active, Array, Format, SdType
 from recs.cfg import Cfg, Track, source, time_settings
-from recs.misc import counter, file_list
+from recs.misc import counter, log
+from recs.misc.file_list import FileList
 
 from .block import Block, Blocks
+from .block_stats import BlockStats
+from .encoder_pool import EncoderPool
 from .file_opener import FileOpener
 from .header_size import header_size
+from .staging import Staging
+from .transcoder import Transcoder
+from .write_behind import WriteBehind
 
 URL = 'https://github.com/rec/recs'
 
+BIG_NUMBER = 0x1_0000_0000_0000
 BUFFER = 128
 FORMAT_TO_SIZE_LIMIT = {
     Format.aiff: 0x8000_0000,
@@ -34,6 +39,15 @@ ITEMSIZE = {
 
 BLOCK_FUZZ = 2
 
+# Encoding these formats is slow enough to be worth moving off the recording path
+COMPRESSED_FORMATS = Format.flac, Format.mp3, Format.ogg
+
+# Create the next file this long before the current one reaches its limit
+PREPARE_TIME = 1
+
+# How many bytes of a take may be held back in memory before its file is created
+MEMORY_BUDGET = 0x100_0000
+
 
 class ChannelWriter(Runnable):
     bytes_in_this_file: int = 0
@@ -43,17 +57,27 @@ class ChannelWriter(Runnable):
 
     largest_file_size: int = 0
     longest_file_frames: int = 0
+    memory_budget: int = MEMORY_BUDGET
 
     timestamp: float = 0
 
-    _sf: SoundFile | None = None
+    _gap: str = ''
+    _is_open: bool = False
+    _opening: tuple[Path, dict[str, str], int] | None = None
+    _pending_bytes: int = 0
+    _prepared: tuple[Path, dict[str, str]] | None = None
 
     @property
     def active(self) -> Active:
-        return Active.active if self._sf else Active.inactive
+        return Active.active if self._is_open else Active.inactive
 
     def __init__(
-        self, cfg: Cfg, times: time_settings.TimeSettings[int], track: Track
+        self,
+        cfg: Cfg,
+        times: time_settings.TimeSettings[int],
+        track: Track,
+        transcoder: Transcoder | None = None,
+        encoders: EncoderPool | None = None,
     ) -> None:
         super().__init__()
 
@@ -63,7 +87,8 @@ class ChannelWriter(Runnable):
         self.times = times
         self.track = track
 
-        self._blocks = Blocks()
+        quiet = times.quiet_before_start, times.quiet_after_end, times.stop_after_quiet
+        self._blocks = Blocks(max(quiet))
         self._lock = Lock()
 
         if track.source.format is None or cfg.cfg.format:
@@ -81,7 +106,7 @@ class ChannelWriter(Runnable):
         else:
             sdtype = SUBTYPE_TO_SDTYPE[track.source.subtype]
 
-        self.files_written = file_list.FileList()
+        self.files_written = FileList()
         self.frame_size = ITEMSIZE[cfg.sdtype or SDTYPE] * len(track.channels)
         self.longest_file_frames = times.longest_file_time
         self.opener = FileOpener(
@@ -90,64 +115,166 @@ class ChannelWriter(Runnable):
             samplerate=track.source.samplerate,
             subtype=subtype,
         )
+        self._reported = ChannelState()
         self._volume = counter.MovingBlock(times.moving_average_time)
+        lane = None
+        if self.format not in COMPRESSED_FORMATS:
+            transcoder = None
+        elif encoders and not transcoder:
+            lane = encoders.lane()
+
+        self._writer = WriteBehind(
+            self.opener,
+            self.files_written,
+            name=str(track),
+            transcoder=transcoder,
+            lane=lane,
+        )
+        self._pending: list[Array] = []
+        self._staging = Staging(self._write)
 
         if not cfg.infinite_length:
             largest = FORMAT_TO_SIZE_LIMIT.get(cfg.format, 0)
             self.largest_file_size = max(largest - BUFFER, 0)
 
-    def receive_update(self, update: source.Update) -> ChannelState:
-        block = Block(update.array[:, self.track.slice])
+    def receive_update(
+        self, update: source.Update, stats: BlockStats | None = None
+    ) -> ChannelState:
+        """Receive an update containing only this track's channels"""
+        block = Block(update.array)
+        if stats:
+            block.seed(stats)
+
         with self._lock:
             return self._receive_block(block, update.timestamp)
 
+    def write_frames(self, arrays: t.Sequence[Array], timestamp: float) -> None:
+        """Write frames as if they had been the loud blocks in the last update,
+        which had this timestamp"""
+        with self._lock:
+            self.timestamp = timestamp
+            self._write_blocks(Block(a) for a in arrays)
+
+    def close_file(self) -> None:
+        with self._lock:
+            self._close()
+
+    def resume(self, gap: float, timestamp: float) -> None:
+        """Record in the next file that `gap` seconds were lost before `timestamp`"""
+        ts = datetime.fromtimestamp(timestamp).isoformat()
+        self._gap = f'Input was offline for {gap:.3f} seconds before {ts}'
+
+    @override
+    def start(self) -> None:
+        self._writer.start()
+        super().start()
+
     @override
     def stop(self) -> None:
         with self._lock:
             self.running = False
             self._write_and_close()
+            self._writer.stop()
             self.stopped = True
 
-    def _close(self) -> None:
-        sf, self._sf = self._sf, None
-        if sf and sf.frames and sf.frames >= self.times.shortest_file_time:
-            sf.close()
-        elif sf:
-            with contextlib.suppress(Exception):
-                sf.close()
-            with contextlib.suppress(Exception):
-                Path(sf.name).unlink()
-
-    def _open(self, offset: int) -> SoundFile:
-        timestamp = self.timestamp - offset / self.track.source.samplerate
-        ts = datetime.fromtimestamp(timestamp)
-
-        index = 1 + len(self.files_written)
+        w = self._writer
+        log.verbose(
+            f'{self.track}: write queue max depth={w.max_depth},',
+            f'mean latency={w.latency.mean():.6f}s',
+        )
 
-        metadata = {'date': ts.isoformat(), 'software': URL, 'tracknumber': str(index)}
-        metadata |= self.metadata
+    def _close(self, rotate: bool = False) -> None:
+        if self._is_open:
+            self._is_open = False
+            self._staging.flush()
+            if self._opening:  # The take was too short to ever create its file
+                self._opening = None
+                self._pending.clear()
+                self._pending_bytes = 0
+
+            frames = self.frames_in_this_file
+            keep = bool(frames) and frames >= self.times.shortest_file_time
+            self.files_written.set_size(self.bytes_in_this_file if keep else 0)
+            self._writer.close(keep, rotate)
+            if not rotate:
+                self._prepared = None
+
+    def _open(self, offset: int) -> None:
+        if self._prepared:
+            (path, metadata), self._prepared = self._prepared, None
+        else:
+            timestamp = self.timestamp - offset / self.track.source.samplerate
+            path, metadata = self._file_info(timestamp, 1 + len(self.files_written))
+            if self._gap:
+                metadata = {'comment': self._gap} | metadata
+                self._gap = ''
 
         self.bytes_in_this_file = header_size(metadata, self.cfg.format)
         self.frames_in_this_file = 0
 
+        self.files_written.append(self.opener.path(path))
+        self.files_written.set_size(self.bytes_in_this_file)
+        self._opening = path, metadata, len(self.files_written) - 1
+        self._is_open = True
+
+    def _materialize(self) -> None:
+        # Create the file, and write out all the frames that were held back
+        if self._opening:
+            self._writer.open(*self._opening)
+            self._opening = None
+
+            for array in self._pending:
+                self._writer.write(array)
+            self._pending.clear()
+            self._pending_bytes = 0
+
+    def _write(self, array: Array) -> None:
+        if not self._opening:
+            self._writer.write(array)
+            return
+
+        self._pending.append(array)
+        self._pending_bytes += array.nbytes
+        if self._pending_bytes > self.memory_budget:
+            self._materialize()  # Spill to disk, even if the file is later deleted
+
+    def _prepare(self, offset: int) -> None:
+        # Prepare the next file ahead of time, starting exactly where this one ends
+        if not self._prepared:
+            frames = offset + self._frames_left()
+            timestamp = self.timestamp + frames / self.track.source.samplerate
+            self._prepared = self._file_info(timestamp, 1 + len(self.files_written))
+            self._writer.prepare(*self._prepared)
+
+    def _file_info(self, timestamp: float, index: int) -> tuple[Path, dict[str, str]]:
+        ts = datetime.fromtimestamp(timestamp)
+        metadata = {'date': ts.isoformat(), 'software': URL, 'tracknumber': str(index)}
+        metadata |= self.metadata
+
         path = self.cfg.output_directory.make_path(
             self.track, self.cfg.aliases, timestamp, index
         )
-        sf = self.opener.create(metadata, path)
-        self.files_written.append(Path(sf.name))
-        return sf
+        return path, metadata
 
-    def _receive_block(self, block: Block, timestamp: float) -> ChannelState:
-        saved_state = self._state(
-            max_amp=max(block.max) / block.scale,
-            min_amp=min(block.min) / block.scale,
-        )
+    def _frames_left(self) -> int:
+        """How many more frames fit into the current file"""
+        remains = [BIG_NUMBER]
 
+        if self.longest_file_frames:
+            remains.append(self.longest_file_frames - self.frames_in_this_file)
+
+        if self.largest_file_size:
+            file_bytes = self.largest_file_size - self.bytes_in_this_file
+            remains.append(file_bytes // self.frame_size)
+
+        return max(min(remains), 0)
+
+    def _receive_block(self, block: Block, timestamp: float) -> ChannelState:
         dt = self.timestamp - timestamp
         self.timestamp = timestamp
         self._volume(block)
 
-        if not self.do_not_record and (self._sf or not self.stopped):
+        if not self.do_not_record and (self._is_open or not self.stopped):
             expected_dt = len(block) / self.track.source.samplerate
 
             if dt > expected_dt * BLOCK_FUZZ:  # We were asleep, or otherwise lost time
@@ -156,8 +283,8 @@ class ChannelWriter(Runnable):
             self._blocks.append(block)
 
             if block.volume >= self.times.noise_floor_amplitude:
-                if not self._sf:  # Record some quiet before the first block
-                    length = self.times.quiet_before_start + len(self._blocks[-1])
+                if not self._is_open:  # Record some quiet before the first block
+                    length = self.times.quiet_before_start + len(block)
                     self._blocks.clip(length, from_start=True)
 
                 self._write_blocks(self._blocks)
@@ -166,53 +293,72 @@ class ChannelWriter(Runnable):
             if self.stopped or self._blocks.duration > self.times.stop_after_quiet:
                 self._write_and_close()
 
-        return self._state() - saved_state
+        delta = self._delta()
+        delta.max_amp = float(block.max.max()) / block.scale
+        delta.min_amp = float(block.min.min()) / block.scale
+        return delta
+
+    def report(self) -> ChannelState:
+        """Return the change in state since the last update or report"""
+        with self._lock:
+            return self._delta()
+
+    def _delta(self) -> ChannelState:
+        # The files are written on another thread, so report the change since the
+        # last report, rather than the change during one update
+        state = self._state()
+        delta, self._reported = state - self._reported, state
+        return delta
 
-    def _state(self, **kwargs: t.Any) -> ChannelState:
+    def _state(self) -> ChannelState:
         return ChannelState(
             file_count=len(self.files_written),
             file_size=self.files_written.total_size,
-            is_active=bool(self._sf),
+            is_active=self._is_open,
             recorded_time=self.frames_written / self.track.source.samplerate,
             timestamp=self.timestamp,
             volume=tuple(self._volume.mean()),
-            **kwargs,
+            write_errors=self._writer.errors,
         )
 
     def _write_and_close(self) -> None:
         # Record some quiet after the last block
         removed = self._blocks.clip(self.times.quiet_after_end, from_start=False)
 
-        if self._sf and removed:
-            self._write_blocks(reversed(removed))
+        if self._is_open and removed:
+            self._write_blocks(removed)
 
         self._close()
 
     def _write_blocks(self, blox: t.Iterable[Block]) -> None:
-        blocks = list(blox)
+        arrays = [b.block for b in blox]
 
-        # The last block in the list ends at self.timestamp so
+        # The last array in the list ends at self.timestamp so
         # we keep track of the sample offset before that
-        offset = -sum(len(b) for b in blocks)
+        offset = -sum(len(a) for a in arrays)
+        prepare_frames = PREPARE_TIME * self.track.source.samplerate
 
-        for b in blocks:
-            # Check if this block will overrun the file size or length
-            remains: list[int] = []
+        for array in arrays:
+            while len(array):
+                if self._is_open and not self._frames_left():
+                    self._close(rotate=True)
 
-            if self.longest_file_frames:
-                remains.append(self.longest_file_frames - self.frames_in_this_file)
+                if not self._is_open:
+                    self._open(offset)
 
-            if self._sf and self.largest_file_size:
-                file_bytes = self.largest_file_size - self.bytes_in_this_file
-                remains.append(file_bytes // self.frame_size)
+                # Split the array at the exact frame where the file is full
+                count = min(len(array), max(self._frames_left(), 1))
+                self._staging.append(array[:count])
+                array = array[count:]
+                offset += count
 
-            if remains and min(remains) <= len(b):
-                self._close()
+                self.frames_in_this_file += count
+                self.frames_written += count
+                self.bytes_in_this_file += count * self.frame_size
+                self.files_written.set_size(self.bytes_in_this_file)
 
-            self._sf = self._sf or self._open(offset)
-            self._sf.write(b.block)
-            offset += len(b)
+                if self.frames_in_this_file >= self.times.shortest_file_time:
+                    self._materialize()
 
-            self.frames_in_this_file += len(b)
-            self.frames_written += len(b)
-            self.bytes_in_this_file += len(b) * self.frame_size
+                if self._frames_left() < prepare_frames:
+                    self._prepare(offset)
@@ -0,0 +1,39 @@
+import typing as t
+
+import numpy as np
+
+from recs.base.types import Array
+from recs.cfg.source import to_matrix
+
+Bounds: t.TypeAlias = list[tuple[int, int]]
+
+
+class Deinterleaver:
+    """Split frames into one C-contiguous array per channel slice, in one np.take"""
+
+    _shape: tuple[int, int] = 0, 0
+    _cached: tuple[Array, Bounds] | None = None
+
+    def __init__(self, slices: t.Sequence[slice]) -> None:
+        self.slices = slices
+
+    def __call__(self, array: Array) -> list[Array]:
+        array = to_matrix(array)
+        frames, channels = array.shape
+        index, bounds = self._index(frames, channels)
+
+        gathered = np.take(array.reshape(-1), index)
+        return [gathered[b:e].reshape(frames, -1) for b, e in bounds]
+
+    def _index(self, frames: int, channels: int) -> tuple[Array, Bounds]:
+        if self._cached and self._shape == (frames, channels):
+            return self._cached
+
+        starts = np.arange(frames)[:, None] * channels
+        parts = [(starts + np.arange(channels)[s]).reshape(-1) for s in self.slices]
+        ends = np.cumsum([len(p) for p in parts]).tolist()
+        bounds = list(zip([0, *ends], ends))
+
+        self._shape = frames, channels
+        self._cached = np.concatenate(parts), bounds
+        return self._cached
@@ -0,0 +1,228 @@
+import itertools
+import multiprocessing as mp
+import time
+import traceback
+import typing as t
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.queues import SimpleQueue
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from threa import HasThread, Runnable
+
+from recs.base.types import Array
+
+from .file_opener import FileOpener
+
+Callback: t.TypeAlias = t.Callable[[], None]
+
+# The shared memory ring for each track
+LANE_SIZE = 0x40_0000
+
+# Each ring starts with how many bytes its worker has consumed
+HEADER_SIZE = 8
+
+# How long a lane waits for its worker to make room
+WAIT_TIME = 0.001
+
+
+class EncoderPool(Runnable):
+    """Encode files on worker processes, fed through one shared memory Lane per track"""
+
+    def __init__(self, workers: int = 1) -> None:
+        super().__init__()
+
+        self.workers = workers
+        self._callbacks: dict[int, Callback] = {}
+        self._file_ids = itertools.count()
+        self._lanes: list[Lane] = []
+        self._lock = Lock()
+        self._queues: list[SimpleQueue[t.Any]] = [
+            mp.SimpleQueue() for _ in range(workers)
+        ]
+        self._results: SimpleQueue[int | None] = mp.SimpleQueue()
+        self._processes = [
+            mp.Process(target=_work, args=(q, self._results), daemon=True)
+            for q in self._queues
+        ]
+        self._reader = HasThread(self._read, name='EncoderPool')
+
+    def lane(self) -> 'Lane':
+        """Return a new lane for one track, giving each worker a lane in turn"""
+        with self._lock:
+            lane = Lane(self, len(self._lanes) % self.workers)
+            self._lanes.append(lane)
+        return lane
+
+    def start(self) -> None:
+        # Workers share this process's tracker, which forgets each lane once
+        # the lane is unlinked here
+        resource_tracker.ensure_running()
+        for p in self._processes:
+            p.start()
+        self._reader.start()
+        super().start()
+
+    def stop(self) -> None:
+        if self.running:
+            for q in self._queues:
+                q.put(None)
+            for p in self._processes:
+                p.join()
+            self._results.put(None)
+            self._reader.join()
+
+            for lane in self._lanes:
+                lane.memory.close()
+                lane.memory.unlink()
+        super().stop()
+
+    def _command(self, worker: int, *command: t.Any) -> None:
+        self._check(worker)
+        self._queues[worker].put(command)
+
+    def _check(self, worker: int) -> None:
+        # Nothing would ever read the commands for a worker which has died
+        if not (process := self._processes[worker]).is_alive():
+            msg = f'Encoder worker {worker} exited with code {process.exitcode}'
+            raise ChildProcessError(msg)
+
+    def _read(self) -> None:
+        while (file_id := self._results.get()) is not None:
+            if callback := self._callbacks.pop(file_id, None):
+                try:
+                    callback()
+                except Exception:
+                    traceback.print_exc()
+
+
+class Lane:
+    """A ring of shared memory that carries the frames for one track's files"""
+
+    def __init__(self, pool: EncoderPool, worker: int) -> None:
+        self.pool = pool
+        self.worker = worker
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=HEADER_SIZE + LANE_SIZE
+        )
+        self._consumed = np.ndarray((1,), np.int64, buffer=self.memory.buf)
+        self._consumed[0] = 0
+        self._produced = 0
+
+    def create(
+        self, opener: FileOpener, metadata: t.Mapping[str, str], path: Path
+    ) -> 'EncodedFile':
+        """Reserve a name for a new file now, and have the worker open it"""
+        path = opener.reserve(path)
+        file_id = next(self.pool._file_ids)
+        self.pool._command(self.worker, 'open', file_id, path, dict(metadata), opener)
+        return EncodedFile(self, file_id, str(path))
+
+    def write(self, file_id: int, array: Array) -> None:
+        # A chunk of at most half the ring always fits, even when it has to
+        # skip the bytes at the end of the ring
+        frame_bytes = max(array[:1].nbytes, 1)
+        frames = max(LANE_SIZE // 2 // frame_bytes, 1)
+        for i in range(0, len(array), frames):
+            self._write(file_id, array[i : i + frames])
+
+    def close(self, file_id: int, keep: bool, callback: Callback | None) -> None:
+        if callback:
+            self.pool._callbacks[file_id] = callback
+        self.pool._command(self.worker, 'close', file_id, keep)
+
+    def _write(self, file_id: int, array: Array) -> None:
+        size = array.nbytes
+        start = self._produced % LANE_SIZE
+        if start + size > LANE_SIZE:
+            # Chunks are contiguous, so skip the bytes at the end of the ring
+            start = 0
+        used = size + (start - self._produced) % LANE_SIZE
+
+        while self._produced + used - int(self._consumed[0]) > LANE_SIZE:
+            self.pool._check(self.worker)
+            time.sleep(WAIT_TIME)
+
+        offset = HEADER_SIZE + start
+        buffer = np.ndarray(array.shape, array.dtype, self.memory.buf, offset)
+        buffer[:] = array
+
+        self._produced += used
+        command = 'write', file_id, self.memory.name, start, used, array.shape
+        self.pool._command(self.worker, *command, array.dtype.str)
+
+
+class EncodedFile:
+    """A file which is being written by a worker in an EncoderPool"""
+
+    def __init__(self, lane: Lane, file_id: int, name: str) -> None:
+        self.lane = lane
+        self.file_id = file_id
+        self.name = name
+
+    def write(self, array: Array) -> None:
+        self.lane.write(self.file_id, array)
+
+    def close(self, callback: Callback | None = None) -> None:
+        """Close the file, then call `callback` in the recording process"""
+        self.lane.close(self.file_id, True, callback)
+
+    def delete(self) -> None:
+        self.lane.close(self.file_id, False, None)
+
+
+def _work(queue: SimpleQueue[t.Any], results: SimpleQueue[int | None]) -> None:
+    files: dict[int, t.Any] = {}
+    lanes: dict[str, shared_memory.SharedMemory] = {}
+
+    while (command := queue.get()) is not None:
+        action, file_id, *args = command
+        try:
+            if action == 'open':
+                path, metadata, opener = args
+                try:
+                    files[file_id] = opener.open(path, metadata, overwrite=True)
+                except Exception:
+                    path.unlink(missing_ok=True)  # The name that was reserved
+                    raise
+
+            elif action == 'write':
+                name, start, used, shape, dtype = args
+                if not (memory := lanes.get(name)):
+                    memory = lanes[name] = shared_memory.SharedMemory(name)
+                try:
+                    if sf := files.get(file_id):
+                        _write(sf, memory, start, shape, dtype)
+                finally:
+                    _consume(memory, used)
+
+            elif action == 'close':
+                (keep,) = args
+                try:
+                    if sf := files.pop(file_id, None):
+                        sf.close()
+                        if not keep:
+                            Path(sf.name).unlink(missing_ok=True)
+                finally:
+                    results.put(file_id)
+
+        except Exception:
+            traceback.print_exc()
+
+    for sf in files.values():
+        sf.close()
+    for memory in lanes.values():
+        memory.close()
+
+
+def _write(
+    sf: t.Any, memory: shared_memory.SharedMemory, start: int, shape: t.Any, dtype: str
+) -> None:
+    sf.write(np.ndarray(shape, dtype, memory.buf, HEADER_SIZE + start))
+
+
+def _consume(memory: shared_memory.SharedMemory, used: int) -> None:
+    # The lane can reuse this memory once it sees the new count
+    consumed = np.ndarray((1,), np.int64, buffer=memory.buf)
+    consumed[0] += used
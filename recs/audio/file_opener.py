@@ -16,10 +16,13 @@ class FileOpener:
     samplerate: int = 48_000
     subtype: Subtype | None = None
 
+    def path(self, path: Path | str) -> Path:
+        return Path(path).with_suffix('.' + self.format)
+
     def open(
         self, path: Path | str, metadata: t.Mapping[str, str], overwrite: bool = False
     ) -> sf.SoundFile:
-        path = Path(path).with_suffix('.' + self.format)
+        path = self.path(path)
         if not overwrite and path.exists():
             raise FileExistsError(str(path))
 
@@ -47,3 +50,17 @@ class FileOpener:
                 return self.open(f, metadata)
             except FileExistsError:
                 pass
+
+    def reserve(self, path: Path) -> Path:
+        """Create an empty file with a new name, like create(), to open later"""
+        path.parent.mkdir(exist_ok=True, parents=True)
+
+        for i in itertools.count():
+            f = self.path(path.parent / (path.name + bool(i) * f'_{i}'))
+            try:
+                f.touch(exist_ok=False)
+                return f
+            except FileExistsError:
+                pass
+
+        raise AssertionError('Unreachable')
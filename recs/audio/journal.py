@@ -0,0 +1,143 @@
+import contextlib
+import glob
+import itertools
+import json
+import os
+import typing as t
+from pathlib import Path
+
+import numpy as np
+
+from recs.base.types import Array, Format, Subtype
+
+from .file_opener import FileOpener
+
+# A journal starts with this line, then a line of JSON, padded to a multiple of
+# HEADER_ALIGN bytes
+MAGIC = b'recs journal 1\n'
+HEADER_ALIGN = 0x1000
+SUFFIX = '.journal'
+
+# How many frames to encode at once
+CHUNK_FRAMES = 0x10000
+
+
+class Journal:
+    """Raw frames for one file, which can be encoded into it later, even after a crash"""
+
+    def __init__(self, opener: FileOpener, metadata: t.Mapping[str, str], path: Path):
+        self.opener = opener
+        self.metadata = dict(metadata)
+        self.name = str(path)
+        self.path = journal_path(path)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        self._has_header = False
+        _write(self._fd, MAGIC)
+
+    @staticmethod
+    def create(
+        opener: FileOpener, metadata: t.Mapping[str, str], path: Path
+    ) -> 'Journal':
+        """Create a journal for a new file, like FileOpener.create()"""
+        path.parent.mkdir(exist_ok=True, parents=True)
+
+        for i in itertools.count():
+            p = opener.path(path.parent / (path.name + bool(i) * f'_{i}'))
+            if not p.exists():
+                with contextlib.suppress(FileExistsError):
+                    return Journal(opener, metadata, p)
+
+        raise AssertionError('Unreachable')
+
+    def write(self, array: Array) -> None:
+        if not self._has_header:
+            self._has_header = True
+            _write(self._fd, self._header(array.dtype))
+
+        _write(self._fd, np.ascontiguousarray(array).data.cast('B'))
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def delete(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _header(self, dtype: np.dtype) -> bytes:
+        header = {
+            'channels': self.opener.channels,
+            'dtype': dtype.str,
+            'format': str(self.opener.format),
+            'metadata': self.metadata,
+            'samplerate': self.opener.samplerate,
+            'subtype': self.opener.subtype and str(self.opener.subtype),
+        }
+        line = json.dumps(header).encode() + b'\n'
+        return line + b' ' * (-(len(MAGIC) + len(line)) % HEADER_ALIGN)
+
+
+def journal_path(path: Path | str) -> Path:
+    return Path(f'{path}{SUFFIX}')
+
+
+def transcode(journal: Path) -> Path | None:
+    """Encode a journal into its file and delete it, or return None if it is empty"""
+    with journal.open('rb') as fp:
+        magic = fp.read(len(MAGIC))
+        line = fp.readline(HEADER_ALIGN)
+
+    if magic != MAGIC:
+        raise ValueError(f'Not a journal: {journal}')
+
+    if not line.endswith(b'\n'):
+        journal.unlink()
+        return None
+
+    header = json.loads(line)
+    offset = len(MAGIC) + len(line)
+    offset += -offset % HEADER_ALIGN
+    dtype = np.dtype(header['dtype'])
+    channels = header['channels']
+    frames = max(journal.stat().st_size - offset, 0) // (dtype.itemsize * channels)
+    if not frames:
+        journal.unlink()
+        return None
+
+    opener = FileOpener(
+        channels=channels,
+        format=Format(header['format']),
+        samplerate=header['samplerate'],
+        subtype=(s := header['subtype']) and Subtype(s),
+    )
+    path = Path(str(journal).removesuffix(SUFFIX))
+    data = np.memmap(journal, dtype, 'r', offset, (frames, channels))
+
+    with opener.open(path, header['metadata'], overwrite=True) as sf:
+        for i in range(0, frames, CHUNK_FRAMES):
+            sf.write(data[i : i + CHUNK_FRAMES])
+
+    del data
+    journal.unlink()
+    return path
+
+
+def find_journals(globs: t.Iterable[str]) -> list[Path]:
+    """Find the journals next to paths which start with any of `globs`"""
+    found = (glob.glob(g + '*' + SUFFIX) for g in globs)
+    return sorted({Path(p) for paths in found for p in paths if _is_journal(p)})
+
+
+def _is_journal(path: str) -> bool:
+    try:
+        with open(path, 'rb') as fp:
+            return fp.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _write(fd: int, data: bytes | memoryview) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
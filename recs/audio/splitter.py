@@ -0,0 +1,189 @@
+import contextlib
+import typing as t
+from collections import deque
+
+import numpy as np
+import soundfile as sf
+
+from recs.base.types import Array
+from recs.cfg import Cfg, FileSource, Track, time_settings
+from recs.cfg.file_source import BLOCKSIZE
+from recs.misc.chunk_reader import ChunkReader
+from recs.misc.file_list import FileList
+from recs.misc.pcm_map import map_pcm
+
+from . import block_stats
+from .channel_writer import ChannelWriter
+
+Range: t.TypeAlias = tuple[int, int]
+
+# How many frames to measure at once, a whole number of blocks
+CHUNK_FRAMES = BLOCKSIZE * 0x40
+
+# FileSource decodes files which it can't map as float64
+DTYPE = 'float64'
+
+
+class Segment(t.NamedTuple):
+    """The frames a ChannelWriter writes in one call, and whether it then closes"""
+
+    ranges: tuple[Range, ...]
+    timestamp: float
+    close: bool
+
+
+def split(cfg: Cfg, track: Track) -> FileList:
+    """Split a file as a FileSource would, reading only the frames that get written"""
+    source = t.cast(FileSource, track.source)
+    times = cfg.times.scale(source.samplerate)
+
+    volumes = envelope(source.chunks(), track.slice)
+    frames = sf.info(str(source.path)).frames
+
+    if times.total_run_time:
+        # The recording stops at the end of the block which reaches the limit
+        blocks = -(-times.total_run_time // BLOCKSIZE)
+        volumes, frames = volumes[:blocks], min(frames, blocks * BLOCKSIZE)
+
+    writer = ChannelWriter(cfg, times, track)
+    with writer:
+        if not writer.do_not_record:
+            with contextlib.closing(_Reader(source, track.slice)) as reader:
+                for s in segments(volumes, frames, times, source.samplerate):
+                    if s.ranges:
+                        arrays = [reader.read(*r) for r in s.ranges]
+                        writer.write_frames(arrays, s.timestamp)
+                    if s.close:
+                        writer.close_file()
+
+    return writer.files_written
+
+
+def envelope(chunks: t.Iterable[Array], channels: slice = slice(None)) -> Array:
+    """Return the volume of each block in a file, as ChannelWriter measures it"""
+    volumes: list[Array] = []
+
+    for c in chunks:
+        for i in range(0, len(c), CHUNK_FRAMES):
+            volumes.extend(_volumes(c[i : i + CHUNK_FRAMES, channels]))
+
+    return np.concatenate(volumes) if volumes else np.empty(0)
+
+
+def _volumes(chunk: Array) -> t.Iterator[Array]:
+    # Reduce over contiguous frames, and convert, exactly as block_stats does
+    rows = np.ascontiguousarray(chunk.T)
+    scale = 2 * block_stats.scale(rows.dtype)
+    whole = rows.shape[1] - rows.shape[1] % BLOCKSIZE
+    parts = rows[:, :whole].reshape(len(rows), -1, BLOCKSIZE), rows[:, None, whole:]
+
+    for blocks in parts:
+        if blocks.size:
+            max, min = blocks.max(2), blocks.min(2)
+            amplitude = (max.astype(np.float64) - min) / scale
+            yield np.ascontiguousarray(amplitude.T).mean(1)
+
+
+def segments(
+    volumes: Array,
+    frames: int,
+    times: time_settings.TimeSettings[int],
+    samplerate: int,
+) -> t.Iterator[Segment]:
+    """Yield the writes and closes ChannelWriter makes for blocks with these volumes"""
+    held: deque[list[int]] = deque()
+    duration = 0
+    is_open = False
+    timestamp = 0.0
+
+    def clip(length: int, from_start: bool) -> tuple[Range, ...]:
+        nonlocal duration
+        if duration <= length:
+            return ()
+
+        removed: list[Range] = []
+        if from_start:
+            remove = duration - length
+            while remove:
+                r = held[0]
+                count = min(remove, r[1] - r[0])
+                removed.append((r[0], r[0] + count))
+                r[0] += count
+                remove -= count
+                if r[0] == r[1]:
+                    held.popleft()
+        else:
+            keep = length
+            kept: deque[list[int]] = deque()
+            for begin, end in held:
+                count = min(keep, end - begin)
+                if count:
+                    kept.append([begin, begin + count])
+                if begin + count < end:
+                    removed.append((begin + count, end))
+                keep -= count
+            held.clear()
+            held.extend(kept)
+
+        duration = length
+        return tuple(removed)
+
+    for i, volume in enumerate(volumes):
+        begin, end = i * BLOCKSIZE, min((i + 1) * BLOCKSIZE, frames)
+        timestamp = begin / samplerate
+
+        if held and held[-1][1] == begin:
+            held[-1][1] = end
+        else:
+            held.append([begin, end])
+        duration += end - begin
+
+        if volume >= times.noise_floor_amplitude:
+            if not is_open:  # Record some quiet before the first block
+                clip(times.quiet_before_start + end - begin, from_start=True)
+
+            yield Segment(tuple((b, e) for b, e in held), timestamp, False)
+            is_open = True
+            held.clear()
+            duration = 0
+
+        if duration > times.stop_after_quiet:
+            removed = clip(times.quiet_after_end, from_start=False)
+            if is_open:
+                yield Segment(removed, timestamp, True)
+                is_open = False
+
+    if is_open:
+        removed = clip(times.quiet_after_end, from_start=False)
+        yield Segment(removed, timestamp, True)
+
+
+class _Reader:
+    """Read ranges of frames from a file, mapped if possible"""
+
+    def __init__(self, source: FileSource, channels: slice) -> None:
+        self.channels = channels
+        self.frames = ChunkReader(source.path, source.memory, BLOCKSIZE).frames
+        self.pcm = map_pcm(source.path)
+        self.fp = None if self.pcm is not None else sf.SoundFile(source.path)
+        self._begin = 0
+        self._frames: Array = np.empty((0, source.channels), dtype=DTYPE)
+
+    def close(self) -> None:
+        if self.fp:
+            self.fp.close()
+
+    def read(self, begin: int, end: int) -> Array:
+        if self.pcm is not None:
+            return self.pcm[begin:end, self.channels]
+
+        assert self.fp
+        if not (self._begin <= begin and end <= self._begin + len(self._frames)):
+            # A new array each time, as the arrays returned must stay valid
+            self.fp.seek(begin)
+            frames = max(end - begin, self.frames)
+            self._frames = self.fp.read(frames, dtype=DTYPE, always_2d=True)
+            self._begin = begin
+
+        i = begin - self._begin
+        return self._frames[i : i + end - begin, self.channels]
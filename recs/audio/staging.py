@@ -0,0 +1,40 @@
+import typing as t
+
+import numpy as np
+
+from recs.base.types import Array
+
+STAGING_FRAMES = 0x4000
+
+
+class Staging:
+    """Copy small blocks into a large buffer, and `write` it each time it fills"""
+
+    frames: int = 0
+
+    _buffer: Array | None = None
+
+    def __init__(
+        self, write: t.Callable[[Array], None], size: int = STAGING_FRAMES
+    ) -> None:
+        self.size = size
+        self.write = write
+
+    def append(self, array: Array) -> None:
+        while len(array):
+            if self._buffer is None:
+                shape = max(self.size, 1), *array.shape[1:]
+                self._buffer = np.empty(shape, dtype=array.dtype)
+
+            count = min(len(array), len(self._buffer) - self.frames)
+            self._buffer[self.frames : self.frames + count] = array[:count]
+            self.frames += count
+            array = array[count:]
+
+            if self.frames == len(self._buffer):
+                self.flush()
+
+    def flush(self) -> None:
+        if self.frames and self._buffer is not None:
+            self.write(self._buffer[: self.frames])
+            self._buffer, self.frames = None, 0
@@ -0,0 +1,56 @@
+import traceback
+import typing as t
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+from recs.misc import log
+
+from . import journal
+
+Callback = t.Callable[[Path | None], None]
+
+
+class Transcoder:
+    """Encode finished journals into their files on a lazily started process pool"""
+
+    def __init__(self, workers: int = 1) -> None:
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    def submit(
+        self, path: Path, callback: Callback | None = None
+    ) -> Future[Path | None]:
+        """Encode the journal at `path`, then call `callback` with the file written"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers)
+            future = self._executor.submit(journal.transcode, path)
+
+        def done(f: Future[Path | None]) -> None:
+            try:
+                result = f.result()
+            except Exception:
+                traceback.print_exc()
+                result = None
+            if callback:
+                callback(result)
+
+        future.add_done_callback(done)
+        return future
+
+    def recover(self, globs: t.Iterable[str]) -> list[Future[Path | None]]:
+        """Encode every journal left by a crash or a kill, next to paths which
+        start with any of `globs`"""
+        journals = journal.find_journals(globs)
+        for j in journals:
+            log.verbose('Recovering', j)
+        return [self.submit(j) for j in journals]
+
+    def shutdown(self) -> None:
+        """Wait for every journal submitted to be encoded"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown()
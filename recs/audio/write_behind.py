@@ -0,0 +1,170 @@
+import contextlib
+import time
+import traceback
+import typing as t
+from pathlib import Path
+from queue import Queue
+
+from soundfile import SoundFile
+from threa import HasThread, Runnable
+
+from recs.base.types import Array
+from recs.misc import counter
+from recs.misc.file_list import FileList
+
+from .encoder_pool import EncodedFile, Lane
+from .file_opener import FileOpener
+from .journal import Journal
+from .transcoder import Transcoder
+
+QUEUE_SIZE = 0x400
+
+Item = tuple[float, t.Callable[..., None], tuple[t.Any, ...]]
+File: t.TypeAlias = SoundFile | Journal | EncodedFile
+
+
+class WriteBehind(Runnable):
+    """Perform one track's file operations in order, on a thread of their own"""
+
+    dropped: int = 0
+    error: str = ''
+    failed: int = 0
+    max_depth: int = 0
+
+    def __init__(
+        self,
+        opener: FileOpener,
+        files: FileList,
+        maxsize: int = QUEUE_SIZE,
+        name: str = '',
+        transcoder: Transcoder | None = None,
+        lane: Lane | None = None,
+    ) -> None:
+        super().__init__()
+
+        self.files = files
+        self.latency = counter.Accumulator()
+        self.opener = opener
+        self.maxsize = maxsize
+        self.queue: Queue[Item | None] = Queue()
+        self.thread = HasThread(self._drain, name=f'WriteBehind-{name}')
+        self.transcoder = transcoder
+        self.lane = lane
+
+        self._index = 0
+        self._sf: File | None = None
+        self._prepared: tuple[Path, File] | None = None
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    @property
+    def errors(self) -> int:
+        return self.failed + self.dropped
+
+    def open(self, path: Path, metadata: t.Mapping[str, str], index: int) -> None:
+        """Create a file for `path`, which will be `self.files[index]`"""
+        self._put(self._open, path, metadata, index)
+
+    def write(self, array: Array) -> None:
+        """Write an array, which must not change until it is written"""
+        # Writes are dropped and counted rather than block on a stalled disk
+        if self.depth < self.maxsize:
+            self._put(self._write, array)
+        else:
+            self.dropped += 1
+
+    def close(self, keep: bool, rotate: bool = False) -> None:
+        """Close the file, deleting it unless `keep`; `rotate` keeps a prepared file"""
+        self._put(self._close, keep, rotate)
+
+    def prepare(self, path: Path, metadata: t.Mapping[str, str]) -> None:
+        """Create a file ahead of time, to be used by the next open() of `path`"""
+        self._put(self._prepare, path, metadata)
+
+    def start(self) -> None:
+        self.thread.start()
+        super().start()
+
+    def stop(self) -> None:
+        if self.running:
+            self.queue.put(None)
+            self.thread.join()
+            self._discard()
+        super().stop()
+
+    def _put(self, function: t.Callable[..., None], *args: t.Any) -> None:
+        self.queue.put_nowait((time.perf_counter(), function, args))
+        self.max_depth = max(self.max_depth, self.depth)
+
+    def _drain(self) -> None:
+        while (item := self.queue.get()) is not None:
+            queued_at, function, args = item
+            try:
+                function(*args)
+            except Exception as e:
+                traceback.print_exc()
+                self.error = f'{type(e).__name__}: {e}'
+                self.failed += 1
+            self.latency(time.perf_counter() - queued_at)
+
+    def _open(self, path: Path, metadata: t.Mapping[str, str], index: int) -> None:
+        if self._prepared and self._prepared[0] == path:
+            (_, self._sf), self._prepared = self._prepared, None
+        else:
+            self._discard()
+            self._sf = self._create(metadata, path)
+        self.files[index] = Path(self._sf.name)
+        self._index = index
+
+    def _prepare(self, path: Path, metadata: t.Mapping[str, str]) -> None:
+        self._discard()
+        self._prepared = path, self._create(metadata, path)
+
+    def _write(self, array: Array) -> None:
+        if self._sf:
+            self._sf.write(array)
+
+    def _close(self, keep: bool, rotate: bool = False) -> None:
+        sf, self._sf = self._sf, None
+        if sf and keep:
+            index = self._index
+            if isinstance(sf, Journal):
+                assert self.transcoder
+                sf.close()
+                self.transcoder.submit(sf.path, lambda _: self.files.reconcile(index))
+            elif isinstance(sf, EncodedFile):
+                sf.close(lambda: self.files.reconcile(index))
+            else:
+                sf.close()
+                self.files.reconcile(index)
+        elif sf:
+            _delete(sf)
+            self.files.set_size(0, self._index)
+
+        if not rotate:
+            self._discard()
+
+    def _create(self, metadata: t.Mapping[str, str], path: Path) -> File:
+        if self.transcoder:
+            return Journal.create(self.opener, metadata, path)
+        if self.lane:
+            return self.lane.create(self.opener, metadata, path)
+        return self.opener.create(metadata, path)
+
+    def _discard(self) -> None:
+        if self._prepared:
+            (_, sf), self._prepared = self._prepared, None
+            _delete(sf)
+
+
+def _delete(sf: File) -> None:
+    if not isinstance(sf, SoundFile):
+        sf.delete()
+        return
+
+    with contextlib.suppress(Exception):
+        sf.close()
+    with contextlib.suppress(Exception):
+        Path(sf.name).unlink()
@@ -0,0 +1,65 @@
+import os
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from recs.base.state import ChannelState
+from recs.base.types import Array
+from recs.cfg.source import Update
+
+from .block_stats import BlockStats
+from .channel_writer import ChannelWriter
+
+
+class WriterPool:
+    """Pass each update to every ChannelWriter, on a fixed number of threads"""
+
+    def __init__(self, writers: t.Sequence[ChannelWriter], threads: int = 0) -> None:
+        self.writers = writers
+        self.threads = max(min(threads, len(writers)), 1)
+        self._shards = [
+            range(i, len(writers), self.threads) for i in range(self.threads)
+        ]
+        self._executor = None
+        if self.threads > 1:
+            # The threads start on first use, perhaps from a thread which has
+            # since been pinned to one core, so they take the cores of this one
+            cores = (
+                os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else None
+            )
+            self._executor = ThreadPoolExecutor(
+                self.threads, 'ChannelWriter', _set_cores, (cores,)
+            )
+
+    def __call__(
+        self, arrays: t.Sequence[Array], timestamp: float, stats: BlockStats
+    ) -> list[ChannelState]:
+        """Send each writer its array, and return each writer's change in state"""
+
+        def receive(shard: range) -> list[ChannelState]:
+            return [self._receive(i, arrays[i], timestamp, stats) for i in shard]
+
+        if self._executor is None:
+            return receive(self._shards[0])
+
+        deltas: list[ChannelState] = [ChannelState()] * len(self.writers)
+        for shard, result in zip(
+            self._shards, self._executor.map(receive, self._shards)
+        ):
+            for i, delta in zip(shard, result):
+                deltas[i] = delta
+        return deltas
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _receive(
+        self, i: int, array: Array, timestamp: float, stats: BlockStats
+    ) -> ChannelState:
+        c = self.writers[i]
+        return c.receive_update(Update(array, timestamp), stats[c.track.slice])
+
+
+def _set_cores(cores: set[int] | None) -> None:
+    if cores is not None:
+        os.sched_setaffinity(0, cores)
@@ -1,21 +1,51 @@
-"""
-Print the current devices as JSON without loading any other part of recs.
+"""Print the current devices as JSON without loading any other part of recs.
 
-Called repeatedly as a subprocess to detect devices going off- and online.
+Called repeatedly as a subprocess to detect devices going off- and online, or
+with `--watch SECONDS`, printing only the changes, every SECONDS.
 """
 
 import json
+import sys
+import time
 import typing as t
 
 
-def _query_devices() -> t.Any:
+def _query_devices(refresh: bool = False) -> t.Any:
     try:
         import sounddevice
 
+        if refresh:
+            # PortAudio only looks for devices when it is initialized
+            sounddevice._terminate()
+            sounddevice._initialize()
+
         return sounddevice.query_devices()
     except BaseException:
         return []
 
 
+def _diff(old: dict[str, t.Any], new: dict[str, t.Any]) -> dict[str, list[t.Any]]:
+    return {
+        'added': [v for k, v in new.items() if k not in old],
+        'removed': [k for k in old if k not in new],
+        'changed': [v for k, v in new.items() if k in old and old[k] != v],
+    }
+
+
+def _watch(sleep_time: float) -> None:
+    devices: dict[str, t.Any] = {}
+    for i in range(sys.maxsize):
+        new = {d['name']: d for d in _query_devices(refresh=bool(i))}
+        diff = _diff(devices, new)
+        if not i or any(diff.values()):
+            print(json.dumps(diff), flush=True)
+
+        devices = new
+        time.sleep(sleep_time)
+
+
 if __name__ == '__main__':
-    print(json.dumps(_query_devices(), indent=4))
+    if sys.argv[1:2] == ['--watch']:
+        _watch(float(sys.argv[2]))
+    else:
+        print(json.dumps(_query_devices(), indent=4))
@@ -16,6 +16,7 @@ class CfgRaw:
     #
     calibrate: bool = False
     dry_run: bool = False
+    offline: bool = False
     verbose: bool = False
     info: bool = False
     list_types: bool = False
@@ -32,8 +33,12 @@ class CfgRaw:
     #
     # Audio file format and subtype
     #
+    encoder_pool: int = 0
+    encoders: int = 1
     format: str = ''
+    journal: bool = False
     metadata: t.Sequence[str] = ()
+    read_memory: int = 0x400_0000
     sdtype: str = ''
     subtype: str = ''
     #
@@ -54,6 +59,8 @@ class CfgRaw:
     quiet_after_end: float = 2.0
     quiet_before_start: float = 1.0
     stop_after_quiet: float = 20.0
+    source_workers: int = 0
     total_run_time: float = 0.0
+    writer_threads: int = 0
 
     asdict = dc.asdict
@@ -24,6 +24,12 @@ class ChannelState:
     timestamp: float = dc.field(default_factory=time.time)
     volume: tuple[float, ...] = ()
 
+    # Bytes of this channel's audio waiting in its source's spool
+    spool_depth: int = 0
+
+    # File operations which failed, so audio may be missing from the files
+    write_errors: int = 0
+
     replace = dc.replace
 
     @property
@@ -40,10 +46,12 @@ class ChannelState:
         self.file_count += m.file_count
         self.file_size += m.file_size
         self.recorded_time += m.recorded_time
+        self.write_errors += m.write_errors
 
-        # We copy these three when using +=, but not -=!
+        # We copy these when using +=, but not -=!
         self.condition = m.condition
         self.is_active = m.is_active
+        self.spool_depth = m.spool_depth
         self.timestamp = m.timestamp
         self.volume = m.volume
 
@@ -56,6 +64,7 @@ class ChannelState:
         self.file_count -= m.file_count
         self.file_size -= m.file_size
         self.recorded_time -= m.recorded_time
+        self.write_errors -= m.write_errors
 
         self.max_amp = max(self.max_amp, m.max_amp)
         self.min_amp = min(self.min_amp, m.min_amp)
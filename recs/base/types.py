@@ -1,17 +1,27 @@
 import typing as t
 from enum import auto
 
+import numpy as np
 from strenum import StrEnum
 
+Array: t.TypeAlias = np.ndarray  # type: ignore[type-arg]
 Stop = t.Callable[[], None]
 
 
 class Active(StrEnum):
     active = auto()
+    failed = auto()
     inactive = auto()
     offline = auto()
 
 
+class Overflow(StrEnum):
+    allocate = auto()
+    drop = auto()
+    spill = auto()
+    wait = auto()
+
+
 class SdType(StrEnum):
     float32 = auto()
     int16 = auto()
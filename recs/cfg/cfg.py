@@ -86,8 +86,16 @@ class Cfg:
         self.times = self._times()
 
     def __getattr__(self, k: str) -> t.Any:
+        if k == 'cfg':  # Not yet set, while unpickling
+            raise AttributeError(k)
         return getattr(self.cfg, k)
 
+    def __setstate__(self, state: dict[str, t.Any]) -> None:
+        # A Cfg is sent to each child process already resolved, so that the
+        # children never have to query the devices again
+        self.__dict__.update(state)
+        log.VERBOSE = self.cfg.verbose
+
     def _times(self) -> time_settings.TimeSettings[float]:
         fields = (f.name for f in dc.fields(time_settings.TimeSettings))
         d = {k: getattr(self, k) for k in fields}
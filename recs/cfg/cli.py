@@ -62,6 +62,12 @@ def recs(
         help='Display levels only, do not record',
         rich_help_panel=GENERAL_PANEL,
     ),
+    offline: bool = Option(
+        RECS.offline,
+        '--offline',
+        help='Split files as fast as they can be read, with no display',
+        rich_help_panel=GENERAL_PANEL,
+    ),
     verbose: bool = Option(
         RECS.verbose,
         '-v',
@@ -117,6 +123,18 @@ def recs(
     #
     # File
     #
+    encoder_pool: int = Option(
+        RECS.encoder_pool,
+        '--encoder-pool',
+        help='Encode flac, mp3 and ogg on this many processes per device, not inline',
+        rich_help_panel=FILE_PANEL,
+    ),
+    encoders: int = Option(
+        RECS.encoders,
+        '--encoders',
+        help='How many processes per device encode journals into files',
+        rich_help_panel=FILE_PANEL,
+    ),
     format: types.Format = Option(
         RECS.format,
         '-f',
@@ -125,6 +143,12 @@ def recs(
         help='Audio file format',
         rich_help_panel=FILE_PANEL,
     ),
+    journal: bool = Option(
+        RECS.journal,
+        '--journal',
+        help='Record flac, mp3 and ogg as raw journals, encoded in the background',
+        rich_help_panel=FILE_PANEL,
+    ),
     metadata: list[str] = Option(
         RECS.metadata,
         '-m',
@@ -133,6 +157,12 @@ def recs(
         help='Metadata fields to add to output files',
         rich_help_panel=FILE_PANEL,
     ),
+    read_memory: int = Option(
+        RECS.read_memory,
+        '--read-memory',
+        help='The most bytes of memory used to read each input file',
+        rich_help_panel=FILE_PANEL,
+    ),
     sdtype: types.SdType | None = Option(
         RECS.sdtype,
         '-d',
@@ -236,6 +266,12 @@ def recs(
         help='How much quiet before stopping a recording',
         rich_help_panel=RECORD_PANEL,
     ),
+    source_workers: int = Option(
+        RECS.source_workers,
+        '--source-workers',
+        help='How many processes record the sources: 0 means one per source',
+        rich_help_panel=RECORD_PANEL,
+    ),
     total_run_time: str = Option(
         RECS.total_run_time,
         '-t',
@@ -244,6 +280,12 @@ def recs(
         help='How many seconds to record? 0 means forever',
         rich_help_panel=RECORD_PANEL,
     ),
+    writer_threads: int = Option(
+        RECS.writer_threads,
+        '--writer-threads',
+        help='How many threads per device pass audio to its tracks: 0 means one',
+        rich_help_panel=RECORD_PANEL,
+    ),
 ) -> None:
     c = cfg.Cfg(**locals())
 
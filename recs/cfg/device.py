@@ -6,16 +6,19 @@ import typing as t
 
 import numpy as np
 from overrides import override
-from threa import Runnable, Wrapper
+from threa import HasThread, Runnable, Wrapper
 
 from recs.base import times
 from recs.base.prefix_dict import PrefixDict
-from recs.base.types import SdType, Stop
+from recs.base.types import SdType
 
 from .source import Source, Update
 
 DeviceDict = dict[str, float | int | str]
 
+# The only fields of a device's info that are used
+INFO_KEYS = 'default_samplerate', 'max_input_channels', 'name'
+
 
 class InputDevice(Source):
     def __init__(self, info: DeviceDict) -> None:
@@ -26,6 +29,9 @@ class InputDevice(Source):
             samplerate=int(self.info['default_samplerate']),
         )
 
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        return InputDevice, ({k: self.info[k] for k in INFO_KEYS},)
+
     @override
     def input_stream(
         self, sdtype: SdType, update_callback: t.Callable[[Update], None]
@@ -45,7 +51,7 @@ class InputDevice(Source):
                 print('Status', self, status, file=sys.stderr)
 
             try:
-                update_callback(Update(indata.copy(), times.timestamp()))
+                update_callback(Update(indata, times.timestamp()))
 
             except Exception:  # pragma: no cover
                 traceback.print_exc()
@@ -85,3 +91,51 @@ def input_names() -> t.Sequence[str]:
 
 def input_devices() -> InputDevices:
     return get_input_devices(query_devices())
+
+
+class DeviceWatcher(Runnable):
+    """Track which devices are online, from one long-lived helper process"""
+
+    synced: bool = False
+
+    _process: sp.Popen[str] | None = None
+
+    def __init__(self, sleep_time: float, devices: t.Iterable[DeviceDict] = ()) -> None:
+        super().__init__()
+        self.sleep_time = sleep_time
+        self.devices = {str(d['name']): d for d in devices}
+        self.thread = HasThread(self._read, name='DeviceWatcher')
+
+    def names(self) -> t.Sequence[str]:
+        return sorted(self.devices)
+
+    def start(self) -> None:
+        cmd = *CMD, '--watch', str(self.sleep_time)
+        self._process = sp.Popen(cmd, text=True, stdout=sp.PIPE)
+        self.thread.start()
+        super().start()
+
+    def stop(self) -> None:
+        if self._process:
+            self._process.terminate()
+            self._process.wait()
+            self.thread.join()
+        super().stop()
+
+    def update(self, diff: t.Mapping[str, t.Sequence[t.Any]]) -> None:
+        # The first diff from the helper contains every device
+        devices = dict(self.devices) if self.synced else {}
+        self.synced = True
+
+        for name in diff['removed']:
+            devices.pop(name, None)
+        for d in (*diff['added'], *diff['changed']):
+            devices[d['name']] = d
+
+        # Replace rather than mutate, because other threads read self.devices
+        self.devices = devices
+
+    def _read(self) -> None:
+        assert self._process and self._process.stdout
+        for line in self._process.stdout:
+            self.update(json.loads(line))
@@ -6,17 +6,19 @@ import soundfile as sf
 from overrides import override
 from threa import HasThread, Runnable
 
-from recs.base.types import Format, SdType, Stop, Subtype
+from recs.base.types import Array, Format, SdType, Stop, Subtype
+from recs.misc.chunk_reader import READ_MEMORY, ChunkReader
+from recs.misc.pcm_map import map_pcm
 
-from .source import Source, Update, to_matrix
+from .source import Source, Update
 
 BLOCKSIZE = 0x1000
-BLOCKCOUNT = 0x1000
 
 
 class FileSource(Source):
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, memory: int = READ_MEMORY) -> None:
         self.path = path
+        self.memory = memory
         assert self.path.exists()
 
         with self._stream() as fp:
@@ -30,6 +32,13 @@ class FileSource(Source):
                 subtype=self.subtype,
             )
 
+    def chunks(self) -> t.Iterable[Array]:
+        """Return the frames of the file in chunks of whole blocks"""
+        if (frames := map_pcm(self.path)) is not None:
+            return (frames,)
+        # Decoded into buffers which are reused, so frames must be copied to be kept
+        return ChunkReader(self.path, self.memory, BLOCKSIZE)
+
     def _stream(self) -> sf.SoundFile:
         return sf.SoundFile(file=self.path, mode='r')
 
@@ -41,16 +50,14 @@ class FileSource(Source):
 
         def input_stream() -> None:
             try:
-                with self._stream() as fp:
-                    timestamp = 0
-                    for block in fp.blocks(BLOCKSIZE * BLOCKCOUNT):
-                        block = to_matrix(block)
-                        for i in range(BLOCKCOUNT):
-                            array = block[i * BLOCKSIZE : (i + 1) * BLOCKSIZE]
-                            if not array.size:
-                                break
-                            update_callback(Update(array, timestamp / self.samplerate))
-                            timestamp += BLOCKSIZE
+                timestamp = 0
+                for chunk in self.chunks():
+                    for i in range(0, len(chunk), BLOCKSIZE):
+                        if not result.running:
+                            return
+                        array = chunk[i : i + BLOCKSIZE]
+                        update_callback(Update(array, timestamp / self.samplerate))
+                        timestamp += BLOCKSIZE
 
             except Exception:
                 traceback.print_exc()
@@ -1,3 +1,4 @@
+import glob
 import re
 import string
 from datetime import datetime
@@ -8,6 +9,7 @@ from recs.base import RecsError
 from recs.cfg import aliases, track
 
 findall_strftime = re.compile('%.').findall
+split_fields = re.compile(r'(\{[^}]*\}|%.)').split
 
 
 def parse_fields(s: str) -> list[str]:
@@ -65,6 +67,11 @@ class PathPattern:
         str_parts = parse_fields(self.path)
         self.strf_parts = tuple(i for i in str_parts if i in FIELD_TO_PSTRING)
 
+    def globs(self) -> tuple[str, ...]:
+        """Glob patterns for the start of every path this pattern makes"""
+        files = glob.escape(self.raw_path) + '/*' if self.raw_path else '*'
+        return _glob(self.path), files
+
     def times(self, ts: datetime) -> dict[str, str]:
         return {k: ts.strftime(FIELD_TO_PSTRING[k]) for k in self.strf_parts}
 
@@ -93,6 +100,21 @@ class PathPattern:
         return Path(p)
 
 
+def _glob(path: str) -> str:
+    parts = []
+    for i, part in enumerate(split_fields(path)):
+        if not i % 2:
+            parts.append(glob.escape(part))
+        elif part == '%%':
+            parts.append('%')
+        else:
+            # Some fields and strftime codes contain slashes
+            pstring = FIELD_TO_PSTRING.get(part.strip('{}'), part)
+            slashes = STRFTIME_DIRS.get(pstring, pstring).count('/')
+            parts.append('/'.join(['*'] * (slashes + 1)))
+    return ''.join(parts)
+
+
 DATE = {Req.year, Req.month, Req.day}
 TIME = {Req.hour, Req.minute, Req.second}
 
@@ -146,6 +168,8 @@ FIELD_TO_REQUIRED: dict[str, set[Req]] = {
 }
 FIELDS = set(FIELD_TO_REQUIRED)
 
+STRFTIME_DIRS = {'%x': '%m/%d/%y'}
+
 FIELD_TO_PSTRING: dict[str, str] = {
     'date': '%Y%m%d',
     'time': '%H%M%S',
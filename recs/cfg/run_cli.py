@@ -4,6 +4,7 @@ import soundfile as sf
 
 from recs.base.types import Format, SdType
 from recs.cfg import device
+from recs.ui import batch
 from recs.ui.recorder import Recorder
 
 from . import Cfg
@@ -14,6 +15,8 @@ def run_cli(cfg: Cfg) -> None:
         _info()
     elif cfg.list_types:
         _list_types()
+    elif cfg.offline:
+        batch.split_files(cfg)
     else:
         Recorder(cfg).run()
 
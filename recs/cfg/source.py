@@ -35,6 +35,8 @@ class Source(hash_cmp.HashCmp, abc.ABC):
     def __str__(self) -> str:
         return self.name
 
+    # The arrays passed to update_callback belong to the caller, and are only
+    # valid for the duration of the call
     @abc.abstractmethod
     def input_stream(
         self, sdtype: SdType, update_callback: t.Callable[[Update], None]
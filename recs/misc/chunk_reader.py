@@ -0,0 +1,70 @@
+import typing as t
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Thread
+
+import numpy as np
+import soundfile as sf
+
+from recs.base.types import Array
+
+# The default for the most memory used to read one file
+READ_MEMORY = 0x400_0000
+
+# One buffer is filled while the other is being used
+BUFFERS = 2
+
+
+class ChunkReader:
+    """Read a sound file in chunks, each valid until the next, reading one ahead"""
+
+    def __init__(
+        self,
+        path: Path | str,
+        memory: int = READ_MEMORY,
+        align: int = 1,
+        dtype: str = 'float64',
+    ) -> None:
+        self.path = path
+        self.dtype = dtype
+
+        with sf.SoundFile(path) as fp:
+            self.channels = fp.channels
+
+        frame_size = self.channels * np.dtype(dtype).itemsize
+        frames = memory // (BUFFERS * frame_size)
+        self.frames = max(frames - frames % align, align)
+
+    def __iter__(self) -> t.Iterator[Array]:
+        empty: SimpleQueue[Array | None] = SimpleQueue()
+        full: SimpleQueue[Array | BaseException | None] = SimpleQueue()
+        for _ in range(BUFFERS):
+            empty.put(np.empty((self.frames, self.channels), self.dtype))
+
+        thread = Thread(target=self._fill, args=(empty, full), daemon=True)
+        thread.start()
+
+        try:
+            while (chunk := full.get()) is not None:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+                yield chunk
+                empty.put(chunk.base if chunk.base is not None else chunk)
+        finally:
+            empty.put(None)
+            thread.join()
+
+    def _fill(
+        self,
+        empty: SimpleQueue[Array | None],
+        full: SimpleQueue[Array | BaseException | None],
+    ) -> None:
+        try:
+            with sf.SoundFile(self.path) as fp:
+                while (buffer := empty.get()) is not None:
+                    if not len(chunk := fp.read(out=buffer)):
+                        break
+                    full.put(chunk)
+        except BaseException as e:
+            full.put(e)
+        full.put(None)
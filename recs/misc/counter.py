@@ -1,12 +1,12 @@
 import dataclasses as dc
 import numbers
 import typing as t
-from collections import deque
 from threading import Lock
 
 import numpy as np
 
 from recs.audio.block import Block
+from recs.base.types import Array
 
 # TODO: isn't there some type comprising these first four?
 Num: t.TypeAlias = (
@@ -53,21 +53,58 @@ class Accumulator:
 
 
 class MovingBlock:
-    _dq: deque[np.ndarray] | None = None  # type: ignore[type-arg]
+    """The moving average and variance of block amplitudes, in O(channels) per block"""
 
-    def __init__(self, moving_average_time: int):
-        self.moving_average_time = moving_average_time
+    count: int = 0
 
-    def __call__(self, b: Block) -> None:
-        if self._dq is None:
-            maxlen = int(0.5 + self.moving_average_time / len(b))
-            self._dq = deque((), maxlen)
+    _index: int = 0
+    _sum: Array
+    _square_sum: Array
+    _window: Array | None = None
 
-        self._dq.append(b.amplitude)
+    def __init__(self, moving_average_time: int, exponential: bool = False):
+        self.moving_average_time = moving_average_time
+        self.exponential = exponential
 
-    def mean(self) -> np.ndarray:  # type: ignore[type-arg]
-        if not self._dq:
+    def __call__(self, b: Block) -> None:
+        x = b.amplitude
+        if self._window is None:
+            maxlen = max(int(0.5 + self.moving_average_time / len(b)), 1)
+            self._window = np.zeros((maxlen, *x.shape))
+            self._sum = np.zeros(x.shape)
+            self._square_sum = np.zeros(x.shape)
+
+        if self.exponential:
+            if self.count:
+                alpha = 2 / (len(self._window) + 1)
+                self._sum += alpha * (x - self._sum)
+                self._square_sum += alpha * (x * x - self._square_sum)
+            else:
+                self._sum[:] = x
+                self._square_sum[:] = x * x
+            self.count = 1
+            return
+
+        old = self._window[self._index]
+        self._sum += x - old
+        self._square_sum += x * x - old * old
+        self._window[self._index] = x
+        self._index = (self._index + 1) % len(self._window)
+        self.count = min(self.count + 1, len(self._window))
+
+        if not self._index:
+            # Remove the rounding error which builds up in the running sums
+            self._sum = self._window.sum(0)
+            self._square_sum = np.square(self._window).sum(0)
+
+    def mean(self) -> Array:
+        if not self.count:
             return np.array([0])
+        return self._sum / self.count
 
-        it = (d for i, d in enumerate(self._dq) if i)
-        return sum(it, start=self._dq[0]) / len(self._dq)
+    def variance(self) -> Array:
+        if not self.count:
+            return np.array([0])
+        mean = self.mean()
+        variance: Array = np.maximum(self._square_sum / self.count - mean * mean, 0)
+        return variance
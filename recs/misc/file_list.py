@@ -1,27 +1,38 @@
 import os
 from pathlib import Path
+from threading import Lock
 
 
 class FileList(list[Path]):
-    """
-    A list of paths with a total size. The size of the last file, only, in the list
-    might be updated after it is added.  Missing files are not reported and count
-    as zero bytes.
+    """A list of paths with a total size, which is computed without touching the disk.
+    Missing files count as zero bytes.
     """
 
-    _count: int = 0
     _total_size: int = 0
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = Lock()
+        self._sizes: list[int] = []
+
     @property
     def total_size(self) -> int:
-        if not self:
-            return 0
-
-        while self._count + 1 < len(self):
-            self._total_size += _getsize(self[self._count])
-            self._count += 1
-
-        return self._total_size + _getsize(self[-1])
+        return self._total_size
+
+    def append(self, path: Path) -> None:
+        with self._lock:
+            super().append(path)
+            self._sizes.append(0)
+
+    def set_size(self, size: int, index: int = -1) -> None:
+        """Set the size of one file, by default the last one"""
+        with self._lock:
+            self._total_size += size - self._sizes[index]
+            self._sizes[index] = size
+
+    def reconcile(self, index: int = -1) -> None:
+        """Set the size of one file from the disk"""
+        self.set_size(_getsize(self[index]), index)
 
 
 def _getsize(p: Path) -> int:
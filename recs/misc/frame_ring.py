@@ -0,0 +1,222 @@
+import contextlib
+import threading
+from collections import deque
+
+import numpy as np
+
+from recs.base.types import Array, Overflow
+
+from .spool import Spool
+
+RING_FRAMES = 0x10000
+RING_SLOTS = 0x400
+
+# The longest a producer waiting for space sleeps before looking again
+WAIT_TIME = 0.05
+
+
+class FrameRing:
+    """A single-producer, single-consumer ring of blocks of frames"""
+
+    dropped: int = 0
+    overflowed: int = 0
+
+    def __init__(
+        self,
+        frames: int = RING_FRAMES,
+        slots: int = RING_SLOTS,
+        overflow: Overflow = Overflow.allocate,
+    ) -> None:
+        self.frames = frames
+        self.slots = slots
+        # When the ring is full, a block is copied into `_overflow`, dropped,
+        # spilled to disk, or waits for space, as `overflow` says
+        self.overflow = overflow
+        # Released by the producer to wake a waiting consumer: releasing a bare
+        # lock is several times cheaper than setting a threading.Event
+        self._wakeup = threading.Lock()
+        self._wakeup.acquire()
+        self._space = threading.Lock()
+        self._space.acquire()
+        self._stopped = False
+        self._closed = False
+
+        self._buffer: Array | None = None
+        self._overflow: deque[tuple[Array, float]] = deque()
+
+        self.spool: Spool | None = None
+        if overflow == Overflow.spill:
+            self.spool = Spool()
+            # Held while a block moves from the deque to the spool
+            self._handoff = threading.Lock()
+            self._spill_wakeup = threading.Event()
+            self._spiller = threading.Thread(
+                target=self._spill, daemon=True, name='FrameRing-spill'
+            )
+            self._spiller.start()
+
+        # Each block's first frame, its length, its frame count including
+        # any frames skipped at the end of the buffer, and its timestamp
+        self._starts = [0] * slots
+        self._lengths = [0] * slots
+        self._used = [0] * slots
+        self._timestamps = [0.0] * slots
+
+        # Written only by the producer
+        self._head = 0
+        self._written = 0
+
+        # Written only by the consumer
+        self._tail = 0
+        self._released = 0
+        self._held = False
+        self._waiting = False
+
+        # Set by the producer while it waits for space, cleared by either side
+        self._full = False
+
+    def __len__(self) -> int:
+        spooled = len(self.spool) if self.spool else 0
+        return self._head - self._tail + len(self._overflow) + spooled
+
+    @property
+    def spooled(self) -> int:
+        """The number of bytes waiting to be read from the spool"""
+        return self.spool.nbytes if self.spool is not None else 0
+
+    def put(self, array: Array, timestamp: float) -> bool:
+        """Copy a block into the ring, returning False if it was dropped"""
+        if self.overflow == Overflow.wait and not self._overflow and self._fits(array):
+            if not self._wait(array, timestamp):
+                self.dropped += 1
+                return False
+
+        elif self._overflow or self.spool or not self._put(array, timestamp):
+            if self.overflow == Overflow.drop:
+                self.dropped += 1
+                return False
+            self.overflowed += 1
+            self._overflow.append((array.copy(), timestamp))
+            if self.spool is not None:
+                self._spill_wakeup.set()
+
+        if self._waiting:
+            self._waiting = False
+            with contextlib.suppress(RuntimeError):
+                # The consumer timed out and the lock was already released
+                self._wakeup.release()
+        return True
+
+    def get(self, timeout: float | None = None) -> tuple[Array, float] | None:
+        """Return the oldest block and timestamp, valid until `release()`, or None"""
+        assert not self._held, 'release() was not called'
+
+        while not self:
+            # A block might have been put just before `_waiting` was set
+            self._waiting = True
+            wait = -1 if timeout is None else timeout
+            woken = bool(self) or self._wakeup.acquire(timeout=wait)
+            self._waiting = False
+            if not woken:
+                return None
+
+        if self._tail == self._head:
+            if self.spool is None:
+                return self._overflow.popleft()
+            with self._handoff:
+                # Blocks in the spool are older than those still in the deque
+                return self.spool.read() or self._overflow.popleft()
+
+        assert self._buffer is not None
+        slot = self._tail % self.slots
+        start = self._starts[slot]
+        self._held = True
+        return self._buffer[start : start + self._lengths[slot]], self._timestamps[slot]
+
+    def stop(self) -> None:
+        """Stop waiting for space: a producer waiting in `put()` drops its block"""
+        self._stopped = True
+        with contextlib.suppress(RuntimeError):
+            self._space.release()
+
+    def close(self) -> None:
+        self.stop()
+        self._closed = True
+        if self.spool is not None:
+            self._spill_wakeup.set()
+            self._spiller.join()
+            self.spool.close()
+
+    def release(self) -> None:
+        """Return the space of the block from the last `get()` to the ring"""
+        if self._held:
+            self._held = False
+            self._released += self._used[self._tail % self.slots]
+            self._tail += 1
+
+            if self._full:
+                self._full = False
+                with contextlib.suppress(RuntimeError):
+                    # The producer timed out and the lock was already released
+                    self._space.release()
+
+    def _fits(self, array: Array) -> bool:
+        b = self._buffer
+        return b is None or (b.shape[1:] == array.shape[1:] and b.dtype == array.dtype)
+
+    def _wait(self, array: Array, timestamp: float) -> bool:
+        while not self._put(array, timestamp):
+            if self._stopped:
+                return False
+
+            # Space might have been released just before `_full` was set
+            self._full = True
+            if self._put(array, timestamp):
+                break
+            self._space.acquire(timeout=WAIT_TIME)
+
+        self._full = False
+        return True
+
+    def _spill(self) -> None:
+        assert self.spool is not None
+        while not self._closed:
+            self._spill_wakeup.wait()
+            self._spill_wakeup.clear()
+
+            while self._overflow:
+                with self._handoff:
+                    if self._overflow:  # The consumer might have just read it
+                        self.spool.append(*self._overflow[0])
+                        self._overflow.popleft()
+
+    def _put(self, array: Array, timestamp: float) -> bool:
+        if self._buffer is None:
+            self._buffer = np.empty((self.frames, *array.shape[1:]), array.dtype)
+
+        elif not self._fits(array):
+            return False
+
+        length = len(array)
+        start = self._written % self.frames
+        if start + length > self.frames:
+            # Blocks are contiguous, so skip the frames at the end of the buffer
+            start = 0
+        used = length + (start - self._written) % self.frames
+
+        if self._head - self._tail >= self.slots:
+            return False
+        if self._written + used - self._released > self.frames:
+            return False
+
+        self._buffer[start : start + length] = array
+
+        slot = self._head % self.slots
+        self._starts[slot] = start
+        self._lengths[slot] = length
+        self._used[slot] = used
+        self._timestamps[slot] = timestamp
+
+        self._written += used
+        self._head += 1
+        return True
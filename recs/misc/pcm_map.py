@@ -0,0 +1,65 @@
+import struct
+import typing as t
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from recs.base.types import Array
+
+# Subtypes whose samples are stored as numpy can read them, in little-endian
+DTYPES = {'PCM_16': '<i2', 'PCM_32': '<i4', 'FLOAT': '<f4', 'DOUBLE': '<f8'}
+
+# Wave64 chunks are named by GUIDs, which start with the RIFF name
+W64_HEADER = 40
+W64_DATA = b'data\xf3\xac\xd3\x11\x8c\xd1\x00\xc0\x4f\x8e\xdb\x8a'
+
+
+def map_pcm(path: Path | str) -> Array | None:
+    """Map the frames of an uncompressed file from disk, or return None"""
+    info = sf.info(str(path))
+    dtype = DTYPES.get(info.subtype)
+    if not (dtype and info.endian == 'FILE' and info.frames):
+        return None
+
+    with open(path, 'rb') as fp:
+        if info.format in ('WAV', 'WAVEX', 'RF64'):
+            offset = _riff_data(fp)
+        elif info.format == 'W64':
+            offset = _w64_data(fp)
+        else:
+            return None
+
+    if offset is None:
+        return None
+
+    frame_size = np.dtype(dtype).itemsize * info.channels
+    frames = min(info.frames, (Path(path).stat().st_size - offset) // frame_size)
+    return np.memmap(path, dtype, 'r', offset, (frames, info.channels))
+
+
+def _riff_data(fp: t.BinaryIO) -> int | None:
+    if fp.read(12)[8:] != b'WAVE':
+        return None
+
+    while len(header := fp.read(8)) == 8:
+        name, size = struct.unpack('<4sI', header)
+        if name == b'data':
+            return fp.tell()
+        fp.seek(size + size % 2, 1)
+
+    return None
+
+
+def _w64_data(fp: t.BinaryIO) -> int | None:
+    fp.seek(W64_HEADER)
+
+    while len(header := fp.read(24)) == 24:
+        name, size = header[:16], struct.unpack('<Q', header[16:])[0]
+        if name == W64_DATA:
+            return fp.tell()
+        if size < 24:
+            return None
+        fp.seek(fp.tell() - 24 + size + -size % 8)
+
+    return None
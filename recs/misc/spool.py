@@ -0,0 +1,67 @@
+import os
+import tempfile
+import typing as t
+from collections import deque
+
+import numpy as np
+
+from recs.base.types import Array
+
+Entry: t.TypeAlias = tuple[int, tuple[int, ...], np.dtype, float]  # type: ignore[type-arg]
+
+
+class Spool:
+    """An append-only file of blocks of frames, read back in order, deleted on close"""
+
+    def __init__(self, dir: str | None = None) -> None:
+        self._file = tempfile.TemporaryFile(prefix='recs-spool-', dir=dir)  # noqa: SIM115
+        self._fd = self._file.fileno()
+        self._entries: deque[Entry] = deque()
+
+        # Written only by the appending thread
+        self._end = 0
+        self._appended = 0
+
+        # Written only by the reading thread
+        self._read = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes waiting to be read"""
+        return self._appended - self._read
+
+    def append(self, array: Array, timestamp: float) -> None:
+        if not self._entries:
+            self._end = 0
+
+        data = np.ascontiguousarray(array).data.cast('B')
+        offset = self._end
+        while data:
+            written = os.pwrite(self._fd, data, offset)
+            data, offset = data[written:], offset + written
+
+        self._entries.append((self._end, array.shape, array.dtype, timestamp))
+        self._end = offset
+        self._appended += array.nbytes
+
+    def read(self) -> tuple[Array, float] | None:
+        if not self._entries:
+            return None
+
+        offset, shape, dtype, timestamp = self._entries[0]
+        size = int(np.prod(shape)) * dtype.itemsize
+        data = bytearray()
+        while len(data) < size:
+            if not (chunk := os.pread(self._fd, size - len(data), offset + len(data))):
+                raise EOFError('The spool file was truncated')
+            data += chunk
+
+        self._entries.popleft()
+        self._read += size
+        return np.frombuffer(data, dtype).reshape(shape), timestamp
+
+    def close(self) -> None:
+        self._file.close()
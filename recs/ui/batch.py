@@ -0,0 +1,17 @@
+from recs.audio import splitter
+from recs.base import RecsError
+from recs.cfg import Cfg
+from recs.misc import log
+
+from .source_tracks import source_tracks
+
+
+def split_files(cfg: Cfg) -> None:
+    """Split each file given on the command line, one after another"""
+    if not cfg.files:
+        raise RecsError('--offline only works on files')
+
+    for _, tracks in source_tracks(cfg):
+        for track in tracks:
+            files = splitter.split(cfg, track)
+            log.verbose(f'{track}: {len(files)} files, {files.total_size} bytes')
@@ -18,14 +18,29 @@ class FullState:
     def elapsed_time(self) -> float:
         return times.timestamp() - self.start_time
 
-    def update(self, state: t.Mapping[str, t.Mapping[str, state.ChannelState]]) -> None:
-        for device_name, device_state in state.items():
+    def update(self, states: t.Sequence[state.ChannelState]) -> None:
+        """Replace the state of every channel, in order, and recompute the total"""
+        total = state.ChannelState()
+        spool_depth = 0
+        it = iter(states)
+
+        for device_state in self.state.values():
             for channel_name, channel_state in device_state.items():
-                self.state[device_name][channel_name] += channel_state
-                self.total += channel_state
+                device_state[channel_name] = s = next(it)
+                s.condition = channel_state.condition
+                total += s
+                spool_depth += s.spool_depth
                 if '-' in channel_name:
                     # This is a stereo channel, so count it again
-                    self.total.recorded_time += channel_state.recorded_time
+                    total.recorded_time += s.recorded_time
+
+        total.spool_depth = spool_depth
+        self.total = total
+
+    def event(self, events: t.Mapping[str, t.Mapping[str, str]]) -> None:
+        for device_name, device_events in events.items():
+            for channel_name, condition in device_events.items():
+                self.state[device_name][channel_name].condition = condition
 
     def rows(self, devices: t.Sequence[str]) -> t.Iterator[dict[str, t.Any]]:
         yield {
@@ -33,6 +48,7 @@ class FullState:
             'recorded': self.total.recorded_time,
             'file_size': self.total.file_size,
             'file_count': self.total.file_count,
+            'spooled': self.total.spool_depth,
         }
 
         for device_name, device_state in self.state.items():
@@ -40,12 +56,17 @@ class FullState:
             yield {'device': device_name, 'on': active}  # TODO: use alias here
 
             for c, s in device_state.items():
+                if s.write_errors:
+                    on = Active.failed
+                else:
+                    on = Active.active if s.is_active else Active.inactive
                 yield {
                     'channel': c,  # TODO: use alias here
-                    'on': Active.active if s.is_active else Active.inactive,
+                    'on': on,
                     'recorded': s.recorded_time,
                     'file_size': s.file_size,
                     'file_count': s.file_count,
+                    'spooled': s.spool_depth,
                     'volume': len(s.volume) and sum(s.volume) / len(s.volume),
                 }
 
@@ -63,6 +63,8 @@ def _on(active: Active) -> str:
         return _rgb(g=0xFF) + '•'
     elif active == Active.offline:
         return _rgb(r=0xFF) + 'ˣ'
+    elif active == Active.failed:
+        return _rgb(r=0xFF) + '!'
     else:
         return ''
 
@@ -121,5 +123,6 @@ TABLE_FORMATTER = TableFormatter(
     recorded=_time_to_str,
     file_size=_naturalsize,
     file_count=str,
+    spooled=_naturalsize,
     volume=_volume,
 )
@@ -0,0 +1,109 @@
+import time
+import typing as t
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from recs.base.state import ChannelState
+
+# Tracks are mono or stereo
+MAX_CHANNELS = 2
+
+# How many times to read the table again if it changes while it is being read
+RETRIES = 8
+
+# Each row is a sequence number followed by these columns, all stored as float64
+COLUMNS = (
+    'file_count',
+    'file_size',
+    'is_active',
+    'max_amp',
+    'min_amp',
+    'recorded_time',
+    'spool_depth',
+    'timestamp',
+    'write_errors',
+    'channels',
+) + tuple(f'volume_{i}' for i in range(MAX_CHANNELS))
+WIDTH = 1 + len(COLUMNS)
+
+
+class MeterTable:
+    """A table of ChannelStates in shared memory, with one row per track"""
+
+    def __init__(self, rows: int, name: str | None = None) -> None:
+        self.rows = rows
+        self.owner = name is None
+        size = max(rows, 1) * WIDTH * np.dtype(np.float64).itemsize
+        self.memory = shared_memory.SharedMemory(name, create=self.owner, size=size)
+        self.table = np.ndarray((rows, WIDTH), dtype=np.float64, buffer=self.memory.buf)
+
+        if self.owner:
+            self.write(0, [ChannelState(timestamp=time.time())] * rows)
+            self.table[:, 0] = 0
+
+    @property
+    def name(self) -> str:
+        return self.memory.name
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        # A new process attaches to the same shared memory
+        return MeterTable, (self.rows, self.name)
+
+    def write(self, offset: int, states: t.Sequence[ChannelState]) -> None:
+        """Write consecutive rows, starting at `offset`"""
+        rows = self.table[offset : offset + len(states)]
+        rows[:, 0] += 1
+        rows[:, 1:] = [_to_row(s) for s in states]
+        rows[:, 0] += 1
+
+    def read(self) -> list[ChannelState]:
+        for _ in range(RETRIES):
+            before = self.table[:, 0].copy()
+            table = self.table.copy()
+            if not (before % 2).any() and (before == self.table[:, 0]).all():
+                break
+
+        return [_to_state(r) for r in table.tolist()]
+
+    def close(self) -> None:
+        # The array must go before the memory that it points into
+        del self.table
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def _to_row(s: ChannelState) -> list[float]:
+    volume = list(s.volume[:MAX_CHANNELS])
+    return [
+        s.file_count,
+        s.file_size,
+        s.is_active,
+        s.max_amp,
+        s.min_amp,
+        s.recorded_time,
+        s.spool_depth,
+        s.timestamp,
+        s.write_errors,
+        len(volume),
+        *volume,
+        *(0,) * (MAX_CHANNELS - len(volume)),
+    ]
+
+
+def _to_state(row: list[float]) -> ChannelState:
+    _, count, size, active, max_amp, min_amp, recorded, spool, ts, errors, *rest = row
+    channels, *volume = rest
+    return ChannelState(
+        file_count=int(count),
+        file_size=int(size),
+        is_active=bool(active),
+        max_amp=max_amp,
+        min_amp=min_amp,
+        recorded_time=recorded,
+        spool_depth=int(spool),
+        timestamp=ts,
+        volume=tuple(volume[: int(channels)]),
+        write_errors=int(errors),
+    )
@@ -1,17 +1,33 @@
+import dataclasses as dc
 import json
 import multiprocessing as mp
+import time
 import typing as t
 from multiprocessing import connection
+from multiprocessing.connection import Connection
 
-from threa import HasThread, Runnables, Wrapper
+from threa import HasThread, Runnable, Runnables
 
+from recs.audio.transcoder import Transcoder
 from recs.base import RecsError
-from recs.cfg import Cfg, Track, device
+from recs.cfg import Cfg, InputDevice, Source, Track, device
+from recs.misc import log
 
 from . import live
 from .full_state import FullState
-from .source_recorder import POLL_TIMEOUT, SourceRecorder
+from .meter_table import MeterTable
+from .source_recorder import FINISH, OFFLINE, POLL_TIMEOUT, RESUMED, SourceRecorder
 from .source_tracks import source_tracks
+from .source_workers import HostedSource, SourceWorkers
+
+# How long it should take from a device reappearing to recording from it again
+RECOVERY_TARGET = 1
+
+# Restart a device this long after it went offline, even if it never seemed to vanish
+RETRY_TIME = 5
+
+# Give up on a device whose process has crashed this many times in a row
+MAX_CRASHES = 3
 
 
 class Recorder(Runnables):
@@ -24,42 +40,222 @@ class Recorder(Runnables):
         self.cfg = cfg
         self.live = live.Live(self.rows, cfg)
         self.state = FullState(all_tracks)
-        self.names = device.input_names()
-        self.connections: list[connection.Connection] = []
-        self.processes: list[mp.Process] = []
-
-        for _, tracks in all_tracks:
-            connection, child = mp.Pipe()
-            self.connections.append(connection)
-            kwargs = {'cfg': cfg.cfg, 'connection': child, 'tracks': tracks}
-            process = mp.Process(target=SourceRecorder, kwargs=kwargs)
-            self.processes.append(process)
+        self.meters = MeterTable(sum(len(tracks) for _, tracks in all_tracks))
+        devices = (d.info for d in cfg.devices.values())
+        self.device_watcher = device.DeviceWatcher(cfg.sleep_time_device, devices)
+        self.supervisor = Supervisor(cfg, all_tracks, self)
+        self.transcoder = Transcoder(cfg.encoders)
 
         ui_time = 1 / self.cfg.ui_refresh_rate
         live_thread = HasThread(
             self.live.update, looping=True, name='LiveUpdate', pre_delay=ui_time
         )
 
-        self.runnables = *(Wrapper(p) for p in self.processes), live_thread, self.live
+        self.runnables = self.device_watcher, self.supervisor, live_thread, self.live
 
     def rows(self) -> t.Iterator[dict[str, t.Any]]:
-        yield from self.state.rows(self.names)
+        self.state.update(self.meters.read())
+        offline = self.supervisor.offline()
+        names = [n for n in self.device_watcher.names() if n not in offline]
+        yield from self.state.rows(names)
 
     def run(self) -> None:
+        if self.cfg.journal:
+            # Journals left by a crash are encoded while recording goes on
+            self.transcoder.recover(self.cfg.output_directory.globs())
+
         try:
             self._run()
         finally:
+            self.transcoder.shutdown()
+            self.state.update(self.meters.read())
+            self.meters.close()
             if self.cfg.calibrate or self.cfg.verbose:
                 print(json.dumps(self.state.db_ranges(), indent=2))
 
     def _run(self) -> None:
         with self:
-            while self.running and all(p.is_alive() for p in self.processes):
-                for c in connection.wait(self.connections, timeout=POLL_TIMEOUT):
-                    conn = t.cast(connection.Connection, c)
-                    try:
-                        msg = conn.recv()
-                    except EOFError:
-                        pass
-                    else:
-                        self.state.update(msg)
+            while self.running and self.supervisor.running:
+                self.supervisor.poll(POLL_TIMEOUT)
+
+
+@dc.dataclass
+class SourceProcess:
+    """One source, and the process recording it, if any"""
+
+    source: Source
+    tracks: t.Sequence[Track]
+    offset: int
+
+    connection: Connection | None = None
+    process: mp.Process | HostedSource | None = None
+
+    crashes: int = 0
+    finished: bool = False
+    missing: bool = False  # The device was seen to vanish since it went offline
+    offline_time: float = 0
+    restart_time: float = 0
+
+    @property
+    def load(self) -> float:
+        return sum(len(t.channels) for t in self.tracks) * self.source.samplerate
+
+
+class Supervisor(Runnable):
+    """Record each source in a process of its own, or on shared worker processes"""
+
+    def __init__(
+        self,
+        cfg: Cfg,
+        all_tracks: t.Sequence[tuple[Source, t.Sequence[Track]]],
+        recorder: Recorder,
+    ) -> None:
+        super().__init__()
+        self.cfg = cfg
+        self.recorder = recorder
+        self.recovery_times: list[float] = []
+
+        offsets = [0]
+        for _, tracks in all_tracks:
+            offsets.append(offsets[-1] + len(tracks))
+        self.sources = [
+            SourceProcess(s, t, o) for (s, t), o in zip(all_tracks, offsets)
+        ]
+        self.workers = SourceWorkers(cfg.source_workers)
+
+    def offline(self) -> set[str]:
+        return {s.source.name for s in self.sources if s.offline_time}
+
+    def start(self) -> None:
+        super().start()
+        self.start_time = time.perf_counter()
+        if self.cfg.source_workers:
+            jobs = [self._job(s) for s in self.sources]
+            loads = [s.load for s in self.sources]
+            live = [isinstance(s.source, InputDevice) for s in self.sources]
+            hosted = self.workers.start(jobs, loads, live)
+            for s, h in zip(self.sources, hosted):
+                s.process = h
+        else:
+            for s in self.sources:
+                self._spawn(s)
+
+    def join(self, timeout: float | None = None) -> None:
+        for s in self.sources:
+            if s.process:
+                s.process.join(timeout)
+        self.workers.join(timeout)
+        super().join(timeout)
+
+    def poll(self, timeout: float) -> None:
+        connections = {s.connection: s for s in self.sources if s.connection}
+        for c in connection.wait(list(connections), timeout=timeout):
+            conn = t.cast(Connection, c)
+            self._receive(connections[conn])
+
+        now = time.perf_counter()
+        names = set(self.recorder.device_watcher.names())
+        run_time = self.cfg.total_run_time
+        expired = run_time and now - self.start_time >= run_time
+
+        for s in self.sources:
+            if s.process and not s.process.is_alive():
+                self._exited(s, now)
+
+            elif not (s.process or s.finished):
+                if expired:
+                    s.finished = True
+                elif s.source.name not in names:
+                    s.missing = True
+                elif s.missing or now - s.offline_time > RETRY_TIME:
+                    self._spawn(s)
+
+        if all(s.finished for s in self.sources):
+            self.running = False
+
+    def _receive(self, s: SourceProcess) -> bool:
+        assert s.connection
+        try:
+            msg = s.connection.recv()
+        except EOFError:
+            return False
+
+        self.recorder.state.event(msg)
+        events = set(msg[s.source.name].values())
+
+        if FINISH in events:
+            s.finished = True
+
+        if OFFLINE in events:
+            s.offline_time = time.perf_counter()
+
+        if RESUMED in events:
+            s.crashes = 0
+
+        if RESUMED in events and s.restart_time:
+            recovery_time = time.perf_counter() - s.restart_time
+            s.restart_time = 0
+            self.recovery_times.append(recovery_time)
+
+            msg = f'{s.source}: recovered in {recovery_time:.3f}s'
+            if recovery_time > RECOVERY_TARGET:
+                log.log(msg, f'which is more than {RECOVERY_TARGET}s')
+            else:
+                log.verbose(msg)
+
+        return True
+
+    def _exited(self, s: SourceProcess, now: float) -> None:
+        assert s.connection and s.process
+        # A closed connection polls as readable forever
+        while s.connection.poll() and self._receive(s):
+            pass
+
+        s.process.join()
+        exitcode = s.process.exitcode
+        s.connection = s.process = None
+
+        if not s.finished and not s.offline_time:
+            # The process neither finished nor went offline, so it crashed
+            msg = f'{s.source}: recording crashed with exit code {exitcode}'
+            live = isinstance(s.source, InputDevice)
+            if live and s.source.name not in self.recorder.device_watcher.names():
+                # The device vanished, and is restarted when it comes back
+                log.log(msg, 'after its device vanished')
+                s.offline_time = now
+            else:
+                s.crashes += 1
+                if live and s.crashes < MAX_CRASHES:
+                    log.log(msg, f'(crash {s.crashes} of {MAX_CRASHES})')
+                    s.offline_time = now
+                else:
+                    log.log(msg, '(giving up)')
+                    s.finished = True
+
+        if s.offline_time or s.crashes:
+            # Tracks of an offline or crashed device aren't recording
+            meters = self.recorder.meters
+            rows = meters.read()[s.offset : s.offset + len(s.tracks)]
+            meters.write(s.offset, [r.replace(is_active=False) for r in rows])
+
+    def _spawn(self, s: SourceProcess) -> None:
+        s.process = mp.Process(target=SourceRecorder, kwargs=self._job(s))
+        s.process.start()
+
+    def _job(self, s: SourceProcess) -> dict[str, t.Any]:
+        resume = 0.0
+        if s.offline_time:
+            s.restart_time = time.perf_counter()
+            resume = s.restart_time - self.start_time
+            s.missing = False
+            s.offline_time = 0
+
+        s.connection, child = mp.Pipe()
+        return {
+            'cfg': self.cfg,
+            'connection': child,
+            'tracks': s.tracks,
+            'meters': self.recorder.meters,
+            'offset': s.offset,
+            'resume': resume,
+        }
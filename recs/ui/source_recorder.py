@@ -1,69 +1,200 @@
 import contextlib
 import os
+import threading
+import time
 import typing as t
 from multiprocessing.connection import Connection
-from queue import Empty, Queue
 
 import numpy as np
 from threa import Runnables
 
+from recs.audio.block_stats import block_stats
 from recs.audio.channel_writer import ChannelWriter
-from recs.base import cfg_raw
-from recs.base.types import Format
-from recs.cfg import Cfg, Track
+from recs.audio.deinterleave import Deinterleaver
+from recs.audio.encoder_pool import EncoderPool
+from recs.audio.transcoder import Transcoder
+from recs.audio.writer_pool import WriterPool
+from recs.base.types import Format, Overflow
+from recs.cfg import Cfg, InputDevice, Track
 from recs.cfg.source import Update
+from recs.misc.frame_ring import FrameRing
+
+from .meter_table import MeterTable
 
 NEW_CODE_FLAG = 'RECS_NEW_CODE' in os.environ
+FILE_CLOSED = 'file_closed'
+FILE_OPENED = 'file_opened'
 FINISH = 'finish'
+OFFLINE = 'offline'
 OFFLINE_TIME = 1
+RESUMED = 'resumed'
 POLL_TIMEOUT = 0.05
 
 
 class SourceRecorder(Runnables):
+    offline: bool = False
     sample_count: int = 0
 
     def __init__(
         self,
-        cfg: cfg_raw.CfgRaw,
+        cfg: Cfg,
         connection: Connection,
         tracks: t.Sequence[Track],
+        meters: MeterTable,
+        offset: int,
+        resume: float = 0,
+        stop: threading.Event | None = None,
+        core: int | None = None,
     ) -> None:
-        self.cfg = Cfg(**cfg.asdict())
+        # If `resume` is non-zero, this source is being restarted, `resume` seconds
+        # after recording started.  A recorder sharing its process with others
+        # finishes when `stop` is set, and its thread is pinned to `core`.
+        self.cfg = cfg
         self.connection = connection
+        self.meters = meters
+        self.offset = offset
+        self.resume = bool(resume)
+        self.stop_event = stop or threading.Event()
+
+        # If this source is being restarted, its totals continue from the table
+        self.states = meters.read()[offset : offset + len(tracks)]
+        self.events: dict[str, str] = {}
+        self.report_interval = 1 / self.cfg.ui_refresh_rate
+        self.report_time = 0.0
 
         self.source = tracks[0].source
         assert all(t.source == self.source for t in tracks)
 
         self.name = self.cfg.aliases.display_name(self.source)
-        self.queue: Queue[Update] = Queue()
+        # If the writers fall behind, a device's blocks spill to disk, not into
+        # memory, while a file is read no faster than the writers can go
+        live = isinstance(self.source, InputDevice)
+        self.ring = FrameRing(overflow=Overflow.spill if live else Overflow.wait)
         self.times = self.cfg.times.scale(self.source.samplerate)
+        self.sample_count = round(resume * self.source.samplerate)
 
-        cw = (ChannelWriter(cfg=self.cfg, times=self.times, track=t) for t in tracks)
+        self.transcoder = Transcoder(cfg.encoders) if cfg.journal else None
+        self.encoder_pool = EncoderPool(cfg.encoder_pool) if cfg.encoder_pool else None
+        cw = (
+            ChannelWriter(
+                cfg=self.cfg,
+                times=self.times,
+                track=t,
+                transcoder=self.transcoder,
+                encoders=self.encoder_pool,
+            )
+            for t in tracks
+        )
         self.channel_writers = tuple(cw)
+        self.writer_pool = WriterPool(self.channel_writers, cfg.writer_threads)
+        self.deinterleave = Deinterleaver([t.slice for t in tracks])
 
         self.input_stream = self.source.input_stream(
             sdtype=self.cfg.sdtype,
-            update_callback=self.queue.put,
+            update_callback=self._put,
         )
-        super().__init__(self.input_stream, *self.channel_writers)
+        pool = (self.encoder_pool,) if self.encoder_pool else ()
+
+        # The pool starts first, and stops after all the writers
+        super().__init__(*pool, self.input_stream, *self.channel_writers)
 
         with contextlib.suppress(KeyboardInterrupt), self:
-            while self.running:
-                with contextlib.suppress(Empty):
-                    self._receive_update(self.queue.get(timeout=POLL_TIMEOUT))
+            if core is not None and hasattr(os, 'sched_setaffinity'):
+                # Only this thread: what was started above keeps every core
+                os.sched_setaffinity(0, {core})
+
+            self.callback_time = time.perf_counter()
+            try:
+                while self.running and not self.stop_event.is_set():
+                    if block := self.ring.get(timeout=POLL_TIMEOUT):
+                        self._receive_update(Update(*block))
+
+                    if self._is_offline():
+                        self.offline = True
+                        self.running = False
+            finally:
+                # A file source waiting for space must not hold up stopping
+                self.ring.stop()
+
+        while block := self.ring.get(timeout=0):
+            self._receive_update(Update(*block))
+        self.ring.close()
+        self.writer_pool.close()
+
+        if self.transcoder:
+            self.transcoder.shutdown()
+
+        # Files are closed on stop, so report once more before finishing
+        for state, c in zip(self.states, self.channel_writers):
+            state += c.report()
+        self._report()
+        event = OFFLINE if self.offline else FINISH
+        self.connection.send({self.source.name: {t.name: event for t in tracks}})
 
-        with contextlib.suppress(Empty):
-            while True:
-                self._receive_update(self.queue.get(block=False))
+    def _put(self, u: Update) -> None:
+        self.callback_time = time.perf_counter()
+        self.ring.put(u.array, u.timestamp)
 
     def _receive_update(self, u: Update) -> None:
-        if self.cfg.format == Format.mp3 and u.array.dtype == np.float32:
+        array = u.array
+        if self.cfg.format == Format.mp3 and array.dtype == np.float32:
             # mp3 and float32 crashes every time on my machine
-            u = Update(u.array.astype(np.float64), u.timestamp)
+            array = array.astype(np.float64)
 
-        msgs = {c.track.name: c.receive_update(u) for c in self.channel_writers}
-        self.connection.send({self.source.name: msgs})
+        if self.resume:
+            self.resume = False
+            self._resume(u)
 
-        self.sample_count += len(u.array)
+        stats = block_stats(array)
+        track_arrays = self.deinterleave(array)
+        self.ring.release()
+
+        deltas = self.writer_pool(track_arrays, u.timestamp, stats)
+        for i, (c, delta) in enumerate(zip(self.channel_writers, deltas)):
+            state = self.states[i]
+            was_active = state.is_active
+            state += delta
+
+            # Only rare events go through the pipe
+            if delta.file_count > 0:
+                self.events[c.track.name] = FILE_OPENED
+            elif was_active and not state.is_active:
+                self.events[c.track.name] = FILE_CLOSED
+
+        if (now := time.perf_counter()) >= self.report_time:
+            self.report_time = now + self.report_interval
+            self._report()
+
+        self.sample_count += len(array)
         if (t := self.times.total_run_time) and self.sample_count >= t:
             self.running = False
+
+    def _is_offline(self) -> bool:
+        # A device which is unplugged stops calling back, without any error.
+        # Callbacks keep coming while the writers are slow, so a long update
+        # doesn't count as the device going away.
+        if not isinstance(self.source, InputDevice):
+            return False
+        return time.perf_counter() - self.callback_time > OFFLINE_TIME
+
+    def _resume(self, u: Update) -> None:
+        frames = len(u.array) / self.source.samplerate
+        if last := max(s.timestamp for s in self.states):
+            gap = max(u.timestamp - frames - last, 0)
+            for c in self.channel_writers:
+                c.resume(gap, u.timestamp - frames)
+
+        resumed = {c.track.name: RESUMED for c in self.channel_writers}
+        self.connection.send({self.source.name: resumed})
+
+    def _report(self) -> None:
+        # Each track's share of the spool is proportional to its channels
+        spooled = self.ring.spooled / self.source.channels
+        for state, c in zip(self.states, self.channel_writers):
+            state.spool_depth = round(spooled * len(c.track.channels))
+
+        # The states are running totals, so only the latest ones need to be sent
+        self.meters.write(self.offset, self.states)
+        if self.events:
+            self.connection.send({self.source.name: self.events})
+            self.events = {}
@@ -10,7 +10,7 @@ def source_tracks(cfg: Cfg) -> t.Iterator[tuple[Source, t.Sequence[Track]]]:
 
     if cfg.files:
         for file in cfg.files:
-            source = FileSource(file)
+            source = FileSource(file, cfg.read_memory)
             channels = '1' if source.channels == 1 else f'1-{source.channels}'
             track = Track(source, channels)
             yield source, [track]
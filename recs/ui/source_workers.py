@@ -0,0 +1,135 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+import typing as t
+from collections import deque
+
+from .source_recorder import SourceRecorder
+
+# How often a HostedSource checks whether its recorder has finished
+JOIN_POLL_TIME = 0.01
+
+# How many file sources each worker records at once
+FILE_JOBS = 2
+
+Job: t.TypeAlias = tuple[int, dict[str, t.Any]]
+
+
+class SourceWorkers:
+    """Record many sources on a fixed number of worker processes, balanced by load"""
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        if hasattr(os, 'sched_getaffinity'):
+            self.cores: list[int] = sorted(os.sched_getaffinity(0))
+        else:
+            self.cores = []
+        self.processes: list[t.Any] = []
+
+    def start(
+        self,
+        jobs: t.Sequence[dict[str, t.Any]],
+        loads: t.Sequence[float],
+        live: t.Sequence[bool],
+    ) -> list['HostedSource']:
+        """Start the workers, and return a stand-in process for each job"""
+        running = mp.Array('b', [1] * len(jobs), lock=False)
+        workers = assign(loads, self.workers)
+
+        for w in range(max(workers, default=-1) + 1):
+            mine = [i for i in range(len(jobs)) if workers[i] == w]
+            devices = [(i, jobs[i]) for i in mine if live[i]]
+            files = [(i, jobs[i]) for i in mine if not live[i]]
+            core = self.cores[w % len(self.cores)] if self.cores else None
+            args = devices, files, running, core
+            process = mp.Process(target=_work, args=args)
+            process.start()
+            self.processes.append(process)
+
+        return [
+            HostedSource(self.processes[w], running, i) for i, w in enumerate(workers)
+        ]
+
+    def join(self, timeout: float | None = None) -> None:
+        for p in self.processes:
+            p.join(timeout)
+
+
+class HostedSource:
+    """Stands in for the process recording one source in a SourceWorkers"""
+
+    def __init__(self, worker: t.Any, running: t.Any, index: int) -> None:
+        self.worker = worker
+        self.running = running
+        self.index = index
+
+    @property
+    def exitcode(self) -> int | None:
+        # A recorder can crash while its worker goes on with other sources
+        return t.cast(int | None, self.worker.exitcode)
+
+    def is_alive(self) -> bool:
+        return bool(self.running[self.index]) and self.worker.is_alive()
+
+    def join(self, timeout: float | None = None) -> None:
+        end = None if timeout is None else time.perf_counter() + timeout
+        while self.is_alive() and (end is None or time.perf_counter() < end):
+            time.sleep(JOIN_POLL_TIME)
+
+
+def assign(loads: t.Sequence[float], workers: int) -> list[int]:
+    """Return a worker for each load, trying to balance the total load"""
+    totals = [0.0] * max(min(workers, len(loads)), 1)
+    result = [0] * len(loads)
+
+    for i in sorted(range(len(loads)), key=lambda i: -loads[i]):
+        w = totals.index(min(totals))
+        totals[w] += loads[i]
+        result[i] = w
+
+    return result
+
+
+def _work(
+    devices: t.Sequence[Job],
+    files: t.Sequence[Job],
+    running: t.Any,
+    core: int | None,
+) -> None:
+    stop = threading.Event()
+    queue = deque(files)
+
+    def record(index: int, job: dict[str, t.Any]) -> None:
+        try:
+            SourceRecorder(stop=stop, core=core, **job)
+        finally:
+            running[index] = 0
+
+    def record_files() -> None:
+        while not stop.is_set():
+            try:
+                index, job = queue.popleft()
+            except IndexError:
+                return
+            threading.current_thread().name = f'Source-{index}'
+            record(index, job)
+
+    threads = [
+        threading.Thread(target=record, args=job, name=f'Source-{job[0]}')
+        for job in devices
+    ]
+    threads.extend(threading.Thread(target=record_files) for _ in files[:FILE_JOBS])
+    for th in threads:
+        th.start()
+
+    try:
+        for th in threads:
+            th.join()
+    except KeyboardInterrupt:
+        stop.set()
+        for th in threads:
+            th.join()
+    finally:
+        for index, _ in queue:  # Files which were never started
+            running[index] = 0
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from recs.audio.block import Block
+from recs.audio.block import Block, Blocks
 
 
 def test_block1():
@@ -65,3 +65,69 @@ def test_rms2():
     print(b, b.asfloat)
     level = 1 / 6**0.5
     assert np.allclose(b.rms, [level, level])
+
+
+@pytest.mark.parametrize('channels', [3, 64])
+@pytest.mark.parametrize('dtype', ['float32', 'int16', 'int32'])
+def test_stats(dtype, channels):
+    rng = np.random.default_rng(seed=23)
+    a = rng.uniform(-0.5, 0.5, size=(257, channels))
+    if dtype != 'float32':
+        a *= np.iinfo(dtype).max
+    b = Block(a.astype(dtype))
+
+    expected = b.block.astype('double')
+    assert np.array_equal(b.max, b.block.max(0))
+    assert np.array_equal(b.min, b.block.min(0))
+    assert np.allclose(b.amplitude, (b.max - expected.min(0)) / (2 * b.scale))
+    assert np.allclose(b.rms, np.sqrt((expected * expected).mean(0)) / b.scale)
+    assert np.isclose(b.volume, b.amplitude.mean())
+
+    s = b.stats[1:3]
+    assert np.array_equal(s.max, b.max[1:3])
+    assert np.array_equal(s.square_sum, b.stats.square_sum[1:3])
+
+
+def _frames(blocks):
+    return [int(i) for b in blocks for i in b.block[:, 0]]
+
+
+def test_blocks_ring():
+    blocks = Blocks(8)
+    for i in range(5):
+        blocks.append(Block(np.arange(3 * i, 3 * i + 3)))
+        blocks.clip(8, from_start=True)
+
+    assert blocks.capacity == 11
+    assert blocks.duration == 8
+    assert _frames(blocks) == list(range(7, 15))
+
+    assert _frames(blocks.clip(5, from_start=True)) == [7, 8, 9]
+    assert _frames(blocks) == list(range(10, 15))
+
+    assert _frames(blocks.clip(2, from_start=False)) == [12, 13, 14]
+    assert _frames(blocks) == [10, 11]
+    assert blocks.clip(2, from_start=False) == []
+
+
+def test_blocks_grow():
+    blocks = Blocks(2)
+    blocks.append(Block(np.arange(2)))
+    blocks.append(Block(np.arange(2, 12)))
+
+    assert blocks.capacity == 12
+    assert _frames(blocks) == list(range(12))
+
+    blocks.clear()
+    assert blocks.duration == 0
+    assert list(blocks) == []
+
+
+def test_seed():
+    a = np.array([[1, 2, 3], [-4, -5, -6]], dtype='int16')
+    stats = Block(a).stats[1:3]
+    b = Block(a[:, 1:3].copy()).seed(stats)
+
+    assert b.stats is stats
+    assert np.array_equal(b.max, [2, 3])
+    assert np.array_equal(b.min, [-5, -6])
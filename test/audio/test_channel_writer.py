@@ -1,4 +1,6 @@
 import dataclasses as dc
+import threading
+from pathlib import Path
 from test import conftest
 
 import numpy as np
@@ -6,10 +8,13 @@ import pytest
 import soundfile as sf
 import tdir
 
+from recs.audio import channel_writer
 from recs.audio.block import Block
 from recs.audio.channel_writer import ChannelWriter
+from recs.audio.file_opener import FileOpener
 from recs.base.types import SDTYPE, Format, SdType, Subtype
 from recs.cfg import Cfg
+from recs.cfg.source import Update
 from recs.cfg.time_settings import TimeSettings
 
 SAMPLERATE = 44_100
@@ -35,13 +40,13 @@ class Case:
 BASE = Case(
     name='base',
     arrays=(17 * OO) + (4 * II) + (40 * OO) + II + (51 * OO) + (19 * II),
-    result=[[28, 16, 12], [28, 4, 12], [28, 76]],
+    result=[[30, 16, 12], [30, 4, 12], [30, 76]],
 )
 LONGEST_FILE_TIME = Case(
     name='longest_file_time',
     arrays=100 * II,
     longest_file_time=210,
-    result=[[0, 208], [0, 192]],
+    result=[[0, 210], [0, 190]],
 )
 
 
@@ -53,7 +58,7 @@ TEST_CASES = (
     Case(
         name='not sure',
         arrays=(4 * II) + (3 * OO) + II + (2000 * OO) + (3 * II),
-        result=[[0, 16, 12, 4, 12], [28, 12]],
+        result=[[0, 16, 12, 4, 12], [30, 12]],
     ),
     LONGEST_FILE_TIME,
     LONGEST_FILE_TIME.replace(format=Format.flac),
@@ -114,3 +119,121 @@ def _on_and_off_segments(it):
                 pb = b
                 pi = i
         yield i + 1 - pi
+
+
+@pytest.mark.parametrize('memory_budget, created', [(0x10000, 0), (16, 1)])
+@tdir
+def test_short_takes(memory_budget, created, mock_devices, monkeypatch):
+    paths = []
+    create = FileOpener.create
+
+    def counting_create(self, metadata, path):
+        paths.append(path)
+        return create(self, metadata, path)
+
+    monkeypatch.setattr(FileOpener, 'create', counting_create)
+
+    cfg = Cfg()
+    track = cfg.aliases.to_track('Ext+2')
+    times = TimeSettings[int](shortest_file_time=100, **TIMES)
+
+    timestamp = conftest.TIMESTAMP
+    with ChannelWriter(cfg, times=times, track=track) as writer:
+        writer.memory_budget = memory_budget
+        for a in (4 * II) + (100 * OO):
+            writer._receive_block(Block(a), timestamp)
+            timestamp += len(a) / SAMPLERATE
+
+    assert len(writer.files_written) == 1
+    assert len(paths) == created
+    assert not any(Path().iterdir())
+
+
+@tdir
+def test_largest_file_size(mock_devices, monkeypatch):
+    header = 0x100
+    monkeypatch.setattr(channel_writer, 'header_size', lambda *a: header)
+
+    paths = []
+    create = FileOpener.create
+
+    def counting_create(self, metadata, path):
+        paths.append(path)
+        return create(self, metadata, path)
+
+    monkeypatch.setattr(FileOpener, 'create', counting_create)
+
+    cfg = Cfg(sdtype=SdType.float32)
+    track = cfg.aliases.to_track('Ext+2')
+    times = TimeSettings[int](**TIMES)
+
+    # Loud frames which are all different, in blocks of 4
+    frames = np.arange(1, 401) * (-1) ** np.arange(400) / 1000
+    frames = frames.astype('float32')
+
+    timestamp = conftest.TIMESTAMP
+    with ChannelWriter(cfg, times=times, track=track) as writer:
+        # Files hold 150 frames, which is not a whole number of blocks
+        writer.largest_file_size = header + 150 * writer.frame_size
+        for i in range(0, len(frames), 4):
+            writer._receive_block(Block(frames[i : i + 4]), timestamp)
+            timestamp += 4 / SAMPLERATE
+
+    files = list(writer.files_written)
+    contents = [sf.read(f, dtype='float32')[0] for f in files]
+    assert [len(c) for c in contents] == [150, 150, 100]
+    assert np.array_equal(np.concatenate(contents), frames)
+
+    # Each file was prepared ahead of time, and the last, unused, one deleted
+    assert len(paths) == 4
+    assert sorted(Path().iterdir()) == sorted(files)
+
+
+@tdir
+def test_track_numbers(mock_devices):
+    cfg = Cfg(output_directory='take-{index}')
+    track = cfg.aliases.to_track('Ext+2')
+    times = TimeSettings[int](longest_file_time=210, **TIMES)
+
+    timestamp = conftest.TIMESTAMP
+    with ChannelWriter(cfg, times=times, track=track) as writer:
+        for a in 160 * II:
+            writer._receive_block(Block(a), timestamp)
+            timestamp += len(a) / SAMPLERATE
+
+    files = list(writer.files_written)
+    assert [str(f.parent) for f in files] == ['take-1', 'take-2', 'take-3', 'take-4']
+    assert [sf.SoundFile(f).tracknumber for f in files] == ['1', '2', '3', '4']
+    assert sorted(Path().glob('*/*')) == sorted(files)
+
+
+@tdir
+def test_stalled_disk(mock_devices):
+    cfg = Cfg()
+    track = cfg.aliases.to_track('Ext+2')
+    times = TimeSettings[int](shortest_file_time=0, **TIMES)
+    stalled = threading.Event()
+
+    with ChannelWriter(cfg, times=times, track=track) as writer:
+        # Every block is written, and the write queue is short
+        writer._staging.size = writer.memory_budget = 4
+        writer._writer.maxsize = 4
+        writer._writer._put(stalled.wait)  # The disk stops responding
+
+        errors = []
+
+        def update():
+            timestamp = conftest.TIMESTAMP
+            for a in 100 * II:
+                delta = writer.receive_update(Update(a, timestamp))
+                errors.append(delta.write_errors)
+                timestamp += len(a) / SAMPLERATE
+
+        thread = threading.Thread(target=update, daemon=True)
+        thread.start()
+        thread.join(5)
+        blocked = thread.is_alive()
+        stalled.set()
+
+    assert not blocked
+    assert sum(errors) == writer._writer.dropped > 0
@@ -0,0 +1,23 @@
+import numpy as np
+
+from recs.audio.deinterleave import Deinterleaver
+
+
+def test_deinterleave():
+    slices = slice(0, 2), slice(2, 3), slice(5, 7)
+    d = Deinterleaver(slices)
+
+    for frames in (4, 3, 4):
+        a = np.arange(frames * 8, dtype='int16').reshape(frames, 8)
+        actual = d(a)
+
+        assert all(i.flags.c_contiguous for i in actual)
+        assert [i.shape for i in actual] == [(frames, 2), (frames, 1), (frames, 2)]
+        assert all(np.array_equal(i, a[:, s]) for i, s in zip(actual, slices))
+
+        assert d._shape == (frames, 8)
+
+    # The index for the last shape only is kept, and reused
+    cached = d._cached
+    d(a)
+    assert d._cached is cached
@@ -0,0 +1,130 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import soundfile as sf
+import tdir
+
+from recs.audio import encoder_pool
+from recs.audio.encoder_pool import EncoderPool
+from recs.audio.file_opener import FileOpener
+from recs.audio.write_behind import WriteBehind
+from recs.base.types import Format
+from recs.misc.file_list import FileList
+
+OPENER = FileOpener(format=Format.flac, channels=2, samplerate=44_100)
+DATA = (np.arange(0x6000, dtype=np.int16) - 0x3000).reshape(-1, 2)
+
+
+@tdir
+def test_encoder_pool(monkeypatch):
+    # A small ring forces chunks to wrap around, and to wait for the worker
+    monkeypatch.setattr(encoder_pool, 'LANE_SIZE', 0x1800)
+    closed = []
+
+    with EncoderPool(2) as pool:
+        lanes = pool.lane(), pool.lane(), pool.lane()
+        assert [lane.worker for lane in lanes] == [0, 1, 0]
+
+        files = [lane.create(OPENER, {'title': 'x'}, Path('x')) for lane in lanes]
+        assert [f.name for f in files] == ['x.flac', 'x_1.flac', 'x_2.flac']
+
+        for i in range(0, len(DATA), 0x500):
+            for f in files:
+                f.write(DATA[i : i + 0x500])
+
+        files[0].close(lambda: closed.append(0))
+        files[1].delete()
+        files[2].close(lambda: closed.append(2))
+
+    assert sorted(closed) == [0, 2]
+    assert sorted(Path().iterdir()) == [Path('x.flac'), Path('x_2.flac')]
+    for name in 'x.flac', 'x_2.flac':
+        data, _ = sf.read(name, dtype='int16')
+        assert np.array_equal(data, DATA)
+        assert sf.SoundFile(name).title == 'x'
+
+
+@tdir
+def test_encoder_pool_large_write(monkeypatch):
+    # A write of the whole ring, starting just past the beginning of the ring
+    monkeypatch.setattr(encoder_pool, 'LANE_SIZE', 0x1000)
+    data = DATA[: 4 + 0x1000 // 4]
+
+    waits = []
+
+    def sleep(t):
+        waits.append(t)
+        assert len(waits) < 5000, 'The lane never has room'
+        time.sleep(t)
+
+    monkeypatch.setattr(encoder_pool, 'time', SimpleNamespace(sleep=sleep))
+
+    with EncoderPool() as pool:
+        f = pool.lane().create(OPENER, {}, Path('x'))
+        f.write(data[:4])
+        f.write(data[4:])
+        f.close()
+
+    assert np.array_equal(sf.read('x.flac', dtype='int16')[0], data)
+
+
+@tdir
+def test_write_behind_encoder_pool():
+    files = FileList()
+    files.append(Path('one.flac'))
+
+    with EncoderPool() as pool, WriteBehind(OPENER, files, lane=pool.lane()) as wb:
+        wb.open(Path('one'), {}, 0)
+        wb.write(DATA)
+        wb.close(keep=True)
+
+    assert sorted(Path().iterdir()) == [Path('one.flac')]
+    assert files.total_size == Path('one.flac').stat().st_size
+    assert np.array_equal(sf.read('one.flac', dtype='int16')[0], DATA)
+
+
+@tdir
+def test_encoder_pool_worker_dies(monkeypatch):
+    monkeypatch.setattr(encoder_pool, 'LANE_SIZE', 0x1000)
+    files = FileList()
+    files.append(Path('one.flac'))
+
+    with EncoderPool() as pool, WriteBehind(OPENER, files, lane=pool.lane()) as wb:
+        wb.open(Path('one'), {}, 0)
+        wb.write(DATA[:0x100])
+        _flush(wb)
+
+        pool._processes[0].kill()
+        pool._processes[0].join()
+
+        # More than the ring holds, so the lane has to wait for a dead worker
+        wb.write(DATA)
+        wb.close(keep=True)
+
+    assert wb.errors == 2
+    assert wb.error.startswith('ChildProcessError: Encoder worker 0 exited')
+
+
+@tdir
+def test_encoder_pool_open_fails(monkeypatch):
+    def open(self, path, metadata, overwrite=False):
+        raise OSError('Disk full')
+
+    monkeypatch.setattr(FileOpener, 'open', open)
+
+    with EncoderPool() as pool:
+        f = pool.lane().create(OPENER, {}, Path('x'))
+        assert f.name == 'x.flac'
+        f.write(DATA)
+        f.close()
+
+    assert not any(Path().iterdir())
+
+
+def _flush(wb):
+    done = threading.Event()
+    wb._put(done.set)
+    assert done.wait(5)
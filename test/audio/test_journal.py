@@ -0,0 +1,115 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+import tdir
+
+from recs.audio import journal
+from recs.audio.file_opener import FileOpener
+from recs.audio.transcoder import Transcoder
+from recs.audio.write_behind import WriteBehind
+from recs.base.types import Format
+from recs.misc.file_list import FileList
+
+OPENER = FileOpener(format=Format.flac, channels=2, samplerate=44_100)
+DATA = (np.arange(0x3000, dtype=np.int16) - 0x1800).reshape(-1, 2)
+
+
+@tdir
+def test_journal():
+    j = journal.Journal.create(OPENER, {'title': 'one'}, Path('one'))
+    j.write(DATA[:0x800])
+    j.write(DATA[0x800:])
+    j.close()
+
+    assert j.name == 'one.flac'
+    assert sorted(Path().iterdir()) == [Path('one.flac.journal')]
+
+    assert journal.transcode(j.path) == Path('one.flac')
+    assert sorted(Path().iterdir()) == [Path('one.flac')]
+
+    data, samplerate = sf.read('one.flac', dtype='int16')
+    assert samplerate == 44_100
+    assert np.array_equal(data, DATA)
+    assert sf.SoundFile('one.flac').title == 'one'
+
+    # The name of an existing file, or journal, is never reused
+    assert journal.Journal.create(OPENER, {}, Path('one')).name == 'one_1.flac'
+    assert journal.Journal.create(OPENER, {}, Path('one')).name == 'one_2.flac'
+
+
+@tdir
+def test_recover():
+    # A crash in the middle of a write leaves part of a frame at the end
+    j = journal.Journal.create(OPENER, {}, Path('a/one'))
+    j.write(DATA)
+    j.close()
+    with j.path.open('ab') as fp:
+        fp.write(b'\0')
+
+    # A crash before the first write leaves an empty journal
+    journal.Journal.create(OPENER, {}, Path('a/b/two')).close()
+
+    transcoder = Transcoder()
+    futures = transcoder.recover(['a/*', 'a/b/*'])
+    transcoder.shutdown()
+
+    assert [f.result() for f in futures] == [None, Path('a/one.flac')]
+    assert sorted(Path().rglob('*.*')) == [Path('a/one.flac')]
+    assert np.array_equal(sf.read('a/one.flac', dtype='int16')[0], DATA)
+
+
+@tdir
+def test_recover_foreign():
+    # Journals which recs didn't write, or which are outside the output paths
+    Path('a/b').mkdir(parents=True)
+    Path('a/notes.journal').write_text('Dear diary\n')
+    Path('a/data.journal').write_text('{"path": "victim.wav"}\n')
+    Path('a/empty.journal').write_bytes(b'')
+
+    j = journal.Journal.create(OPENER, {}, Path('a/b/one'))
+    j.write(DATA)
+    j.close()
+
+    transcoder = Transcoder()
+    futures = transcoder.recover(['a/*'])
+    transcoder.shutdown()
+
+    assert not futures
+    assert sorted(p.name for p in Path('a').rglob('*')) == [
+        'b',
+        'data.journal',
+        'empty.journal',
+        'notes.journal',
+        'one.flac.journal',
+    ]
+    assert Path('a/notes.journal').read_text() == 'Dear diary\n'
+
+    # Even if asked directly, a file which isn't a journal is never deleted
+    with pytest.raises(ValueError):
+        journal.transcode(Path('a/data.journal'))
+    assert Path('a/data.journal').exists()
+
+
+@tdir
+def test_write_behind_journal():
+    files = FileList()
+    files.append(Path('one.flac'))
+    files.append(Path('two.flac'))
+    transcoder = Transcoder()
+
+    with WriteBehind(OPENER, files, transcoder=transcoder) as wb:
+        wb.open(Path('one'), {}, 0)
+        wb.write(DATA)
+        wb.close(keep=True)
+
+        wb.open(Path('two'), {}, 1)
+        wb.write(DATA)
+        wb.close(keep=False)
+
+    transcoder.shutdown()
+
+    assert sorted(Path().iterdir()) == [Path('one.flac')]
+    assert files.total_size == Path('one.flac').stat().st_size
+    assert np.array_equal(sf.read('one.flac', dtype='int16')[0], DATA)
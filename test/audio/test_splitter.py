@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+import tdir
+
+from recs.audio import splitter
+from recs.audio.channel_writer import ChannelWriter
+from recs.cfg import Cfg, FileSource, Track
+
+SAMPLERATE = 8_000
+PATTERN = (3, 0.5), (10, 0), (1, 0.5), (0.7, 0), (2, 0.3), (25, 0), (8, 0.5), (4, 0)
+
+
+def record(cfg, track):
+    # Record as a SourceRecorder would, without the processes and threads
+    times = cfg.times.scale(SAMPLERATE)
+    writer = ChannelWriter(cfg, times, track)
+    frames = 0
+
+    def receive(update):
+        nonlocal frames
+        if not times.total_run_time or frames < times.total_run_time:
+            writer.receive_update(update)
+            frames += len(update.array)
+
+    with writer:
+        stream = track.source.input_stream(cfg.sdtype, receive)
+        stream.start()
+        stream.join()
+
+
+def contents(directory):
+    # The files can't be compared byte for byte, as wav headers hold the time
+    # they were written
+    result = {}
+    for f in sorted(Path(directory).iterdir()):
+        with sf.SoundFile(f) as fp:
+            metadata = fp.date, fp.software, fp.tracknumber, fp.comment
+            result[f.name] = metadata, fp.read().tobytes()
+    return result
+
+
+@tdir
+@pytest.mark.parametrize(
+    'channels, subtype', ((1, 'PCM_16'), (2, 'FLOAT'), (2, 'PCM_24'))
+)
+@pytest.mark.parametrize(
+    'settings',
+    (
+        {},
+        {'quiet_before_start': 3, 'quiet_after_end': 1, 'stop_after_quiet': 2},
+        {'quiet_after_end': 2, 'stop_after_quiet': 0.5},
+        {'longest_file_time': 5},
+        {'shortest_file_time': 4},
+        {'stop_after_quiet': 2, 'total_run_time': 14.5},
+    ),
+)
+def test_split(settings, channels, subtype):
+    rng = np.random.default_rng(0)
+    parts = [
+        rng.uniform(-a, a, (round(s * SAMPLERATE), channels))
+        + rng.normal(0, 1e-5, (1, channels))
+        for s, a in PATTERN
+    ]
+    sf.write('in.wav', np.concatenate(parts), SAMPLERATE, subtype=subtype)
+    track = Track(FileSource(Path('in.wav')), '1-2'[: 2 * channels - 1])
+
+    for d in 'live', 'offline':
+        Path(d).mkdir()
+    settings = {'format': 'wav', 'shortest_file_time': 0} | settings
+    record(Cfg(output_directory='live', **settings), track)
+    files = splitter.split(Cfg(output_directory='offline', **settings), track)
+
+    live, offline = contents('live'), contents('offline')
+    assert len(live) > 1
+    assert live == offline
+    assert sorted(f.name for f in files if f.exists()) == list(offline)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from recs.audio.staging import Staging
+
+
+def test_staging():
+    written = []
+    staging = Staging(written.append, size=8)
+
+    for i in range(5):
+        staging.append(np.arange(3 * i, 3 * i + 3).reshape(3, 1))
+    assert [len(w) for w in written] == [8]
+
+    staging.append(np.arange(15, 30).reshape(15, 1))
+    assert [len(w) for w in written] == [8, 8, 8]
+
+    staging.flush()
+    staging.flush()
+    assert [len(w) for w in written] == [8, 8, 8, 6]
+    assert np.array_equal(np.concatenate(written)[:, 0], np.arange(30))
@@ -0,0 +1,139 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import tdir
+
+from recs.audio.file_opener import FileOpener
+from recs.audio.write_behind import WriteBehind
+from recs.base.types import Format
+from recs.misc.file_list import FileList
+
+
+@tdir
+def test_write_behind():
+    Path('one.wav').write_bytes(b'')
+    files = FileList()
+    files.append(Path('one.wav'))
+    files.append(Path('two.wav'))
+
+    with WriteBehind(FileOpener(format=Format.wav), files) as wb:
+        wb.open(Path('one'), {}, 0)
+        for i in range(4):
+            wb.write(np.full((8, 1), i / 8, dtype='float32'))
+        wb.close(keep=True)
+
+        wb.open(Path('two'), {}, 1)
+        wb.write(np.zeros((8, 1), dtype='float32'))
+        wb.close(keep=False)
+
+    assert wb.latency.count == 9
+    assert files == [Path('one_1.wav'), Path('two.wav')]
+    assert not files[1].exists()
+    assert files.total_size == files[0].stat().st_size
+
+    data, _ = sf.read(files[0])
+    assert np.allclose(data, np.repeat(np.arange(4) / 8, 8))
+
+
+@tdir
+def test_prepare():
+    files = FileList()
+    files.append(Path('one.wav'))
+    files.append(Path('two.wav'))
+
+    with WriteBehind(FileOpener(format=Format.wav), files) as wb:
+        wb.open(Path('one'), {}, 0)
+        wb.write(np.zeros((8, 1), dtype='float32'))
+        wb.prepare(Path('two'), {})
+        wb.close(keep=True, rotate=True)
+
+        wb.open(Path('two'), {}, 1)
+        wb.write(np.full((8, 1), 0.5, dtype='float32'))
+        wb.prepare(Path('three'), {})
+        wb.close(keep=True)
+
+    assert files == [Path('one.wav'), Path('two.wav')]
+    assert sorted(Path().iterdir()) == files
+    assert np.allclose(sf.read(files[1])[0], 0.5)
+
+
+@tdir
+def test_prepare_is_used(monkeypatch):
+    paths = []
+    create = FileOpener.create
+
+    def counting_create(self, metadata, path):
+        paths.append(path)
+        return create(self, metadata, path)
+
+    monkeypatch.setattr(FileOpener, 'create', counting_create)
+    files = FileList()
+    files.append(Path('one.wav'))
+
+    with WriteBehind(FileOpener(format=Format.wav), files) as wb:
+        wb.prepare(Path('one'), {})
+        _flush(wb)
+        prepared = wb._prepared[1]
+        assert Path('one.wav').exists()
+
+        # Opening the prepared path takes the file that was already created
+        wb.open(Path('one'), {}, 0)
+        _flush(wb)
+        assert wb._sf is prepared and not wb._prepared
+        wb.close(keep=True)
+
+    assert paths == [Path('one')]
+    assert sorted(Path().iterdir()) == [Path('one.wav')]
+
+
+@tdir
+def test_prepare_is_discarded():
+    files = FileList()
+    files.append(Path('one.wav'))
+
+    with WriteBehind(FileOpener(format=Format.wav), files) as wb:
+        # A file prepared for another path is deleted when a file is opened
+        wb.prepare(Path('two'), {})
+        wb.open(Path('one'), {}, 0)
+        wb.write(np.zeros((8, 1), dtype='float32'))
+        _flush(wb)
+        assert not Path('two.wav').exists()
+
+        # A file prepared for a rotation that never came is deleted on stop
+        wb.prepare(Path('three'), {})
+        wb.close(keep=True, rotate=True)
+        _flush(wb)
+        assert Path('three.wav').exists()
+
+    assert sorted(Path().iterdir()) == [Path('one.wav')]
+
+
+@tdir
+def test_write_behind_error():
+    # A file where the directory should be, as good as a full or read-only disk
+    Path('blocked').write_bytes(b'')
+    files = FileList()
+    files.append(Path('blocked/one.wav'))
+    files.append(Path('two.wav'))
+
+    with WriteBehind(FileOpener(format=Format.wav), files) as wb:
+        wb.open(Path('blocked/one'), {}, 0)
+        wb.write(np.zeros((8, 1), dtype='float32'))
+        wb.close(keep=True)
+
+        wb.open(Path('two'), {}, 1)
+        wb.write(np.zeros((8, 1), dtype='float32'))
+        wb.close(keep=True)
+
+    assert wb.errors == 1
+    assert wb.error.startswith('FileExistsError')
+    assert sorted(Path().iterdir()) == [Path('blocked'), Path('two.wav')]
+
+
+def _flush(wb):
+    # Wait until every operation queued so far has been performed
+    done = threading.Event()
+    wb._put(done.set)
+    assert done.wait(5)
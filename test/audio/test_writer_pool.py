@@ -0,0 +1,48 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from recs.audio.block_stats import block_stats
+from recs.audio.writer_pool import WriterPool
+from recs.base.state import ChannelState
+
+
+class Track:
+    def __init__(self, i):
+        self.slice = slice(i, i + 1)
+
+
+class Writer:
+    def __init__(self, i):
+        self.track = Track(i)
+        self.threads = set()
+        self.timestamps = []
+
+    def receive_update(self, update, stats):
+        # Later tracks finish first
+        time.sleep(0.001 / (1 + self.track.slice.start))
+        self.threads.add(threading.get_ident())
+        self.timestamps.append(update.timestamp)
+        return ChannelState(file_count=self.track.slice.start, max_amp=stats.max[0])
+
+
+@pytest.mark.parametrize('threads', [0, 1, 3, 16])
+def test_writer_pool(threads):
+    writers = [Writer(i) for i in range(8)]
+    pool = WriterPool(writers, threads)
+    try:
+        for timestamp in range(5):
+            array = np.arange(8, dtype='float32').reshape(1, 8) + timestamp
+            arrays = [array[:, i : i + 1] for i in range(8)]
+            deltas = pool(arrays, timestamp, block_stats(array))
+
+            assert [d.file_count for d in deltas] == list(range(8))
+            assert [d.max_amp for d in deltas] == list(range(timestamp, timestamp + 8))
+    finally:
+        pool.close()
+
+    assert pool.threads == min(max(threads, 1), 8)
+    assert all(w.timestamps == list(range(5)) for w in writers)
+    assert len(set.union(*(w.threads for w in writers))) <= pool.threads
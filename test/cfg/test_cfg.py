@@ -1,10 +1,11 @@
+import pickle
 from pathlib import Path
 from test.conftest import DEVICES_FILE
 
 import pytest
 
 from recs.base import RecsError
-from recs.cfg import Cfg
+from recs.cfg import Cfg, device
 
 
 def test_sdtype(mock_devices):
@@ -21,3 +22,15 @@ def test_bad_devices(mock_devices):
 def test_devices(mock_devices):
     cfg = Cfg(devices=DEVICES_FILE)
     assert cfg.devices
+
+
+def test_pickle(mock_devices, monkeypatch):
+    cfg = Cfg(alias=['e=Ext + 1'], output_directory='{device}')
+    monkeypatch.setattr(device, 'query_devices', None)
+
+    cfg2 = pickle.loads(pickle.dumps(cfg))
+    assert cfg2.devices == cfg.devices
+    assert cfg2.aliases.to_track('e') == cfg.aliases.to_track('e')
+    assert cfg2.output_directory.raw_path == '{device}'
+    assert cfg2.times == cfg.times
+    assert cfg2.format == cfg.format
@@ -1,6 +1,35 @@
+import time
+
 from recs.cfg import device
 
 
 def test_input_devices():
     if d := device.input_devices():
         print(next(iter(d.values())))
+
+
+def test_device_watcher():
+    a, b, c = ({'name': n, 'max_input_channels': 2} for n in 'abc')
+    watcher = device.DeviceWatcher(0.1, [a, b])
+    assert watcher.names() == ['a', 'b']
+
+    watcher.update({'added': [b, c], 'removed': [], 'changed': []})
+    assert watcher.names() == ['b', 'c']
+
+    a2 = a | {'max_input_channels': 4}
+    watcher.update({'added': [a2], 'removed': ['b'], 'changed': []})
+    assert watcher.names() == ['a', 'c']
+
+    watcher.update({'added': [], 'removed': [], 'changed': [a]})
+    assert watcher.devices['a'] == a
+
+
+def test_device_watcher_process():
+    with device.DeviceWatcher(0.01, [{'name': 'a'}]) as watcher:
+        for _ in range(1000):
+            if watcher.synced:
+                break
+            time.sleep(0.01)
+
+    assert watcher.synced
+    assert isinstance(watcher.names(), list)
@@ -100,3 +100,16 @@ def test_bad_minute(mock_devices):
         PathPattern('{minute}')
 
     assert e.value.args == ('Must specify hour or second with minute: {minute}',)
+
+
+@pytest.mark.parametrize(
+    'path, globs',
+    (
+        ('', ('* + ***-***', '*')),
+        ('out', ('out/* + ***-***', 'out/*')),
+        ('out[1]/{sdate}', ('out[[]1]/*/*/*/* + ***', 'out[[]1]/{sdate}/*')),
+        ('{device}/%x', ('*/*/*/*/* + ***', '{device}/%x/*')),
+    ),
+)
+def test_globs(path, globs):
+    assert PathPattern(path).globs() == globs
@@ -0,0 +1,48 @@
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+import tdir
+
+from recs.misc.chunk_reader import ChunkReader
+
+
+@tdir
+def test_chunk_reader():
+    data = np.random.default_rng(0).uniform(-1, 1, (10_000, 3))
+    sf.write('in.wav', data, 48_000, subtype='DOUBLE')
+
+    reader = ChunkReader('in.wav', memory=48_000, align=128)
+    assert reader.frames == 896
+
+    chunks, buffers = [], set()
+    for chunk in reader:
+        chunks.append(chunk.copy())
+        buffers.add(id(chunk if chunk.base is None else chunk.base))
+
+    assert [len(c) for c in chunks] == 11 * [896] + [144]
+    assert len(buffers) == 2
+    assert np.array_equal(np.concatenate(chunks), data)
+
+
+@tdir
+def test_stop_early():
+    sf.write('in.wav', np.zeros((10_000, 1)), 48_000)
+    threads = threading.active_count()
+
+    for i, chunk in enumerate(ChunkReader('in.wav', memory=0x1000)):
+        if i == 2:
+            break
+
+    assert threading.active_count() == threads
+
+
+@tdir
+def test_error():
+    sf.write('in.wav', np.zeros((10_000, 1)), 48_000)
+    reader = ChunkReader('in.wav')
+    reader.path = 'missing.wav'
+
+    with pytest.raises(sf.LibsndfileError):
+        list(reader)
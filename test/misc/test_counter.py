@@ -1,3 +1,6 @@
+import numpy as np
+
+from recs.audio.block import Block
 from recs.misc import counter
 
 
@@ -17,3 +20,29 @@ def test_accumulator():
     assert a.mean() == 7.5
     assert a.variance() == 77.5
     assert a.stdev() == 77.5**0.5
+
+
+def test_moving_block():
+    rng = np.random.default_rng(seed=0)
+    blocks = [Block(rng.uniform(-1, 1, (8, 2))) for _ in range(40)]
+    amplitudes = np.array([b.amplitude for b in blocks])
+
+    m = counter.MovingBlock(moving_average_time=80)
+    assert list(m.mean()) == [0]
+
+    for i, b in enumerate(blocks):
+        m(b)
+        window = amplitudes[max(i - 9, 0) : i + 1]
+        assert np.allclose(m.mean(), window.mean(0))
+        assert np.allclose(m.variance(), window.var(0))
+
+
+def test_moving_block_exponential():
+    m = counter.MovingBlock(moving_average_time=24, exponential=True)
+    m(Block(np.array(4 * [[0.5], [-0.5]])))
+    assert np.allclose(m.mean(), 0.5)
+    assert np.allclose(m.variance(), 0)
+
+    for _ in range(3):
+        m(Block(np.array(4 * [[0.1], [-0.1]])))
+    assert np.allclose(m.mean(), 0.1 + 0.4 * 0.5**3)
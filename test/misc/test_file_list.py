@@ -8,8 +8,9 @@ from recs.misc.file_list import FileList
 @tdir
 def test_file_list():
     fl = FileList()
+    assert fl.total_size == 0
 
-    # We will write 8 * i bytes in each file
+    # We will write 8 * i bytes in each file, but only estimate the sizes
     ts = 0
     for i in range(8):
         fl.append(Path(str(i)))
@@ -17,8 +18,28 @@ def test_file_list():
         with fl[-1].open('w') as fp:
             for j in range(i):
                 fp.write(8 * 'x')
-                fp.flush()
                 ts += 8
+                fl.set_size(8 * (j + 1))
                 assert fl.total_size == ts
 
     assert fl.total_size == 224
+
+
+@tdir
+def test_reconcile():
+    fl = FileList()
+
+    for i in range(4):
+        fl.append(Path(str(i)))
+        fl[-1].write_bytes(b'x' * i)
+        fl.set_size(100)  # A wrong estimate
+
+    Path('1').unlink()
+    assert fl.total_size == 400
+
+    fl.reconcile(1)
+    fl.reconcile(2)
+    assert fl.total_size == 202
+
+    fl.reconcile()
+    assert fl.total_size == 105
@@ -0,0 +1,185 @@
+import threading
+import time
+
+import numpy as np
+
+from recs.base.types import Overflow
+from recs.misc.frame_ring import FrameRing
+from recs.misc.spool import Spool
+
+
+def _block(i, frames=4):
+    return np.full((frames, 2), i, dtype=np.int16)
+
+
+def test_frame_ring():
+    ring = FrameRing(frames=10, slots=4)
+    assert ring.get(timeout=0) is None
+
+    assert ring.put(_block(1), 1.0)
+    assert ring.put(_block(2), 2.0)
+    assert len(ring) == 2 and not ring.overflowed
+
+    array, timestamp = ring.get()
+    assert timestamp == 1.0 and array.tolist() == [[1, 1]] * 4
+    ring.release()
+
+    # There is no room at the end of the buffer, so this block starts at 0
+    assert ring.put(_block(3), 3.0)
+    assert not ring.overflowed
+
+    # There is no room anywhere, so this block overflows
+    assert ring.put(_block(4), 4.0)
+    assert ring.overflowed == 1
+
+    results = []
+    while block := ring.get(timeout=0):
+        results.append((block[0][0, 0], block[1]))
+        ring.release()
+
+    assert results == [(2, 2.0), (3, 3.0), (4, 4.0)]
+    assert not len(ring)
+
+
+def test_frame_ring_reuses_buffer():
+    # Like the BufferPool it replaced, the ring copies every block into memory
+    # which is allocated once and reused once released
+    ring = FrameRing(frames=10, slots=4)
+    views = []
+    for i in range(20):
+        assert ring.put(_block(i), i)
+        array, _ = ring.get()
+        assert array.tolist() == [[i, i]] * 4
+        views.append(array)
+        ring.release()
+
+    assert not ring.overflowed and not ring.dropped
+    assert all(v.base is ring._buffer for v in views)
+
+
+def test_frame_ring_drop():
+    ring = FrameRing(frames=8, slots=4, overflow=Overflow.drop)
+    assert ring.put(_block(1), 1.0)
+    assert ring.put(_block(2), 2.0)
+    assert not ring.put(_block(3), 3.0)
+    assert ring.dropped == 1
+
+    # Different shapes or dtypes can't go into the buffer
+    assert not ring.put(_block(4, frames=1).astype(np.float32), 4.0)
+    assert ring.dropped == 2
+
+
+def _wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        assert time.time() - start < timeout
+        time.sleep(0.001)
+
+
+def test_frame_ring_spill(monkeypatch):
+    append = Spool.append
+    threads = set()
+
+    def spy(self, array, timestamp):
+        threads.add(threading.current_thread())
+        append(self, array, timestamp)
+
+    monkeypatch.setattr(Spool, 'append', spy)
+
+    ring = FrameRing(frames=8, slots=4, overflow=Overflow.spill)
+    try:
+        for i in range(4):
+            assert ring.put(_block(i), i)
+        assert ring.overflowed == 2
+        _wait_for(lambda: len(ring.spool) == 2)
+        assert ring.spooled == 2 * _block(0).nbytes
+
+        # Blocks keep going to the spool until it is empty, even if there is room
+        ring.get()
+        ring.release()
+        ring.put(_block(4), 4)
+        _wait_for(lambda: len(ring.spool) == 3)
+
+        # The producer never writes to the disk itself
+        assert threading.current_thread() not in threads
+
+        results = []
+        while block := ring.get(timeout=0):
+            results.append((block[0][0, 0], block[1]))
+            ring.release()
+
+        assert results == [(1, 1), (2, 2), (3, 3), (4, 4)]
+        assert not ring.spooled
+    finally:
+        ring.close()
+
+
+def test_frame_ring_slots():
+    ring = FrameRing(frames=100, slots=2)
+    for i in range(3):
+        ring.put(_block(i), i)
+    assert ring.overflowed == 1
+
+
+def test_frame_ring_threads():
+    ring = FrameRing(frames=64, slots=8)
+    count = 2000
+    results = []
+
+    def consume():
+        while len(results) < count:
+            if block := ring.get(timeout=1):
+                results.append(int(block[0][0, 0]))
+                ring.release()
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    for i in range(count):
+        ring.put(_block(i, frames=1 + i % 7).astype(np.int32), i)
+    thread.join()
+
+    assert results == list(range(count))
+
+
+def test_frame_ring_wait():
+    ring = FrameRing(frames=8, slots=4, overflow=Overflow.wait)
+    results = []
+
+    def produce():
+        for i in range(6):
+            ring.put(_block(i), i)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+
+    # The producer fills the ring, then waits for the consumer
+    _wait_for(lambda: len(ring) == 2)
+    time.sleep(0.05)
+    assert len(ring) == 2 and thread.is_alive()
+
+    while len(results) < 6:
+        block = ring.get(timeout=1)
+        results.append(int(block[0][0, 0]))
+        ring.release()
+
+    thread.join()
+    assert results == list(range(6))
+    assert not ring.overflowed and not ring.dropped
+
+
+def test_frame_ring_wait_stop():
+    ring = FrameRing(frames=8, slots=4, overflow=Overflow.wait)
+    assert ring.put(_block(0), 0)
+    assert ring.put(_block(1), 1)
+
+    dropped = []
+    thread = threading.Thread(target=lambda: dropped.append(not ring.put(_block(2), 2)))
+    thread.start()
+    time.sleep(0.05)
+    assert thread.is_alive()
+
+    # A producer waiting for space gives up once the ring is stopped
+    ring.stop()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+    assert dropped == [True] and ring.dropped == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import soundfile as sf
+import tdir
+
+from recs.misc.pcm_map import map_pcm
+
+MAPPED = (
+    ('WAV', 'PCM_16'),
+    ('WAV', 'PCM_32'),
+    ('WAV', 'FLOAT'),
+    ('WAV', 'DOUBLE'),
+    ('WAVEX', 'PCM_16'),
+    ('RF64', 'FLOAT'),
+    ('W64', 'PCM_16'),
+    ('W64', 'DOUBLE'),
+)
+NOT_MAPPED = (
+    ('WAV', 'PCM_24'),
+    ('WAV', 'PCM_U8'),
+    ('FLAC', 'PCM_16'),
+    ('AIFF', 'PCM_16'),
+)
+
+
+@tdir
+@pytest.mark.parametrize('format, subtype', MAPPED)
+def test_map_pcm(format, subtype):
+    data = np.random.default_rng(0).uniform(-1, 1, (5001, 3))
+    sf.write('in.snd', data, 8_000, format=format, subtype=subtype)
+
+    frames = map_pcm('in.snd')
+    assert frames.shape == (5001, 3)
+    assert not frames.flags.writeable
+    assert np.array_equal(frames, sf.read('in.snd', dtype=frames.dtype.name)[0])
+
+
+@tdir
+@pytest.mark.parametrize('format, subtype', NOT_MAPPED)
+def test_not_mapped(format, subtype):
+    data = np.random.default_rng(0).uniform(-1, 1, (5001, 3))
+    sf.write('in.snd', data, 8_000, format=format, subtype=subtype)
+    assert map_pcm('in.snd') is None
+
+
+@tdir
+def test_empty():
+    sf.write('in.wav', np.empty((0, 2)), 8_000)
+    assert map_pcm('in.wav') is None
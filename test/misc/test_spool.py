@@ -0,0 +1,32 @@
+import numpy as np
+
+from recs.misc.spool import Spool
+
+
+def test_spool():
+    spool = Spool()
+    try:
+        assert spool.read() is None
+
+        a = np.arange(12, dtype=np.int16).reshape(6, 2)
+        b = np.arange(8, dtype=np.float32).reshape(2, 4)
+        spool.append(a, 1.0)
+        spool.append(b, 2.0)
+        assert len(spool) == 2
+        assert spool.nbytes == a.nbytes + b.nbytes
+
+        array, timestamp = spool.read()
+        assert timestamp == 1.0 and np.array_equal(array, a)
+        assert array.dtype == a.dtype
+
+        array, timestamp = spool.read()
+        assert timestamp == 2.0 and np.array_equal(array, b)
+        assert not spool and spool.nbytes == 0
+
+        # Once empty, the spool starts again at the start of the file
+        spool.append(b, 3.0)
+        assert spool._entries[0][0] == 0
+        array, _ = spool.read()
+        assert np.array_equal(array, b)
+    finally:
+        spool.close()
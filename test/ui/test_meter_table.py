@@ -0,0 +1,37 @@
+import pickle
+
+from recs.base.state import ChannelState
+from recs.ui.meter_table import MeterTable
+
+
+def test_meter_table():
+    meters = MeterTable(3)
+    try:
+        states = meters.read()
+        assert [s.file_count for s in states] == [0, 0, 0]
+        assert states[0].amp == 0
+
+        a = ChannelState(
+            file_count=2,
+            file_size=1024,
+            is_active=True,
+            max_amp=0.5,
+            min_amp=-0.25,
+            recorded_time=1.5,
+            spool_depth=4096,
+            timestamp=1_700_000_000,
+            volume=(0.25, 0.125),
+            write_errors=3,
+        )
+        b = a.replace(is_active=False, volume=(0.5,))
+
+        child = pickle.loads(pickle.dumps(meters))
+        assert not child.owner
+        child.write(1, [a, b])
+        del child
+
+        states = meters.read()
+        assert states[1:] == [a, b]
+        assert list(meters.table[:, 0]) == [0, 2, 2]
+    finally:
+        meters.close()
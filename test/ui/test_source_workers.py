@@ -0,0 +1,93 @@
+import multiprocessing.dummy
+import threading
+import time
+
+import pytest
+
+from recs.ui import source_workers
+
+
+@pytest.mark.parametrize(
+    'loads, workers, expected',
+    (
+        ([], 2, []),
+        ([1, 1, 1, 1], 2, [0, 1, 0, 1]),
+        ([2, 3, 4, 3], 2, [0, 1, 0, 1]),
+        ([96_000, 48_000, 48_000], 2, [0, 1, 1]),
+        ([1, 2, 3], 8, [2, 1, 0]),
+        ([1, 2, 3], 0, [0, 0, 0]),
+    ),
+)
+def test_assign(loads, workers, expected):
+    assert source_workers.assign(loads, workers) == expected
+
+
+def test_source_workers(monkeypatch):
+    monkeypatch.setattr(source_workers, 'mp', multiprocessing.dummy)
+    finish = threading.Event()
+    recorded = []
+
+    def recorder(name, stop, core):
+        recorded.append((name, threading.current_thread().name))
+        finish.wait()
+
+    monkeypatch.setattr(source_workers, 'SourceRecorder', recorder)
+
+    workers = source_workers.SourceWorkers(2)
+    jobs = [{'name': n} for n in 'abc']
+    hosted = workers.start(jobs, [1, 2, 1], [True] * 3)
+
+    assert len(workers.processes) == 2
+    assert [h.worker for h in hosted] == [workers.processes[i] for i in (1, 0, 1)]
+    assert all(h.is_alive() for h in hosted)
+
+    hosted[0].join(0.05)
+    assert hosted[0].is_alive()
+
+    finish.set()
+    workers.join()
+    assert not any(h.is_alive() for h in hosted)
+    assert sorted(recorded) == [('a', 'Source-0'), ('b', 'Source-1'), ('c', 'Source-2')]
+
+
+def test_source_workers_files(monkeypatch):
+    monkeypatch.setattr(source_workers, 'mp', multiprocessing.dummy)
+    lock = threading.Lock()
+    finish = {n: threading.Event() for n in 'abcdef'}
+    running, most = set(), []
+
+    def recorder(name, stop, core):
+        with lock:
+            running.add(name)
+            most.append(len(running - {'a'}))
+        finish[name].wait()
+        with lock:
+            running.remove(name)
+
+    monkeypatch.setattr(source_workers, 'SourceRecorder', recorder)
+
+    # One device and five files, all on one worker
+    workers = source_workers.SourceWorkers(1)
+    jobs = [{'name': n} for n in 'abcdef']
+    hosted = workers.start(jobs, [1] * 6, [True] + [False] * 5)
+
+    wait_for(lambda: len(running) == 1 + source_workers.FILE_JOBS)
+    assert running == {'a', 'b', 'c'}
+    assert all(h.is_alive() for h in hosted)
+
+    for n in 'bcdef':
+        finish[n].set()
+    wait_for(lambda: running == {'a'})
+    assert max(most) == source_workers.FILE_JOBS
+    assert [h.is_alive() for h in hosted] == [True] + [False] * 5
+
+    finish['a'].set()
+    workers.join()
+    assert not any(h.is_alive() for h in hosted)
+
+
+def wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        assert time.time() - start < timeout
+        time.sleep(0.01)
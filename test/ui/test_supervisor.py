@@ -0,0 +1,124 @@
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+import tdir
+from threa import HasThread, Runnable
+
+from recs.base import times
+from recs.cfg import Cfg, InputDevice, device
+from recs.cfg.source import Update
+from recs.ui import recorder, source_recorder
+from test.conftest import BLOCK_SIZE
+
+PLUGGED = {'Ext': True, 'Mic': True}
+
+
+def input_stream(self, sdtype, update_callback):
+    rng = np.random.default_rng(self.channels)
+    array = rng.uniform(-0.5, 0.5, (BLOCK_SIZE, self.channels)).astype(sdtype)
+
+    def callback():
+        if PLUGGED[self.name]:
+            update_callback(Update(array, times.timestamp()))
+        time.sleep(BLOCK_SIZE / self.samplerate)
+
+    return HasThread(callback, looping=True, name=f'Stream-{self.name}')
+
+
+def wait_for(condition, timeout=5):
+    start = time.time()
+    while not condition():
+        assert time.time() - start < timeout
+        time.sleep(0.01)
+
+
+@tdir
+def test_recovery(mock_mp, mock_devices, monkeypatch):
+    monkeypatch.setattr(InputDevice, 'input_stream', input_stream)
+    monkeypatch.setattr(device.DeviceWatcher, 'start', Runnable.start)
+    monkeypatch.setattr(device.DeviceWatcher, 'stop', Runnable.stop)
+    monkeypatch.setattr(source_recorder, 'OFFLINE_TIME', 0.3)
+
+    cfg = Cfg(
+        include=['Ext', 'Mic'], shortest_file_time=0, silent=True, total_run_time=2
+    )
+    rec = recorder.Recorder(cfg)
+    supervisor, watcher = rec.supervisor, rec.device_watcher
+    devices = watcher.devices
+
+    thread = HasThread(rec.run, name='Recorder')
+    with thread:
+        wait_for(lambda: all(s.recorded_time for s in rec.meters.read()))
+
+        PLUGGED['Mic'] = False
+        watcher.devices = {k: v for k, v in devices.items() if k != 'Mic'}
+        wait_for(lambda: supervisor.offline() == {'Mic'})
+        wait_for(lambda: supervisor.sources[1].missing)
+        assert [s.process is not None for s in supervisor.sources] == [True, False]
+        assert 'Mic' not in [
+            r.get('device') for r in rec.rows() if r.get('on') == 'active'
+        ]
+
+        PLUGGED['Mic'] = True
+        watcher.devices = devices
+        wait_for(lambda: supervisor.recovery_times)
+        assert supervisor.recovery_times[0] < recorder.RECOVERY_TARGET
+
+    assert all(s.finished for s in supervisor.sources)
+
+    comments = [sf.SoundFile(f).comment for f in sorted(Path().glob('Mic*'))]
+    assert comments[0] == ''
+    assert comments[-1].startswith('Input was offline for 0.')
+
+
+@tdir
+def test_slow_update_is_not_offline(mock_mp, mock_devices, monkeypatch):
+    monkeypatch.setattr(InputDevice, 'input_stream', input_stream)
+    monkeypatch.setattr(source_recorder, 'OFFLINE_TIME', 0.3)
+
+    receive_update = source_recorder.SourceRecorder._receive_update
+    stalled = []
+
+    def slow_receive_update(self, u):
+        receive_update(self, u)
+        if not stalled:  # As if the disk stalled while writing
+            stalled.append(True)
+            time.sleep(0.6)
+
+    monkeypatch.setattr(
+        source_recorder.SourceRecorder, '_receive_update', slow_receive_update
+    )
+
+    cfg = Cfg(include=['Ext'], shortest_file_time=0, silent=True, total_run_time=1)
+    rec = recorder.Recorder(cfg)
+    rec.run()
+
+    assert stalled
+    assert not rec.supervisor.offline()
+    assert all(s.finished for s in rec.supervisor.sources)
+
+
+@tdir
+def test_crash_is_not_retried_forever(mock_mp, mock_devices, monkeypatch):
+    opened = []
+
+    def broken_input_stream(self, sdtype, update_callback):
+        opened.append(self.name)
+        raise ValueError('Cannot open stream')
+
+    monkeypatch.setattr(InputDevice, 'input_stream', broken_input_stream)
+    monkeypatch.setattr(recorder, 'RETRY_TIME', 0.05)
+    monkeypatch.setattr(threading, 'excepthook', lambda args: None)
+
+    cfg = Cfg(include=['Ext'], shortest_file_time=0, silent=True)
+    rec = recorder.Recorder(cfg)
+    thread = threading.Thread(target=rec.run, daemon=True)
+    thread.start()
+    wait_for(lambda: not thread.is_alive())
+
+    assert opened == ['Ext'] * recorder.MAX_CRASHES
+    assert all(s.finished for s in rec.supervisor.sources)
+    assert not rec.supervisor.offline()